@@ -11,10 +11,13 @@ Implements an improved placement algorithm with:
 - Detailed debugging and logging
 - Advanced priority handling for multiple variables
 """
-from typing import List, Dict, Optional, Tuple, Set, Any
+from typing import List, Dict, Optional, Tuple, Set, Any, NamedTuple
+import bisect
 import math
+import re
 import time
 import heapq
+from functools import lru_cache
 from datetime import datetime, timedelta
 from backend.models.item import Item
 from backend.models.container import Container
@@ -24,6 +27,81 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Item schema flags, resolved once instead of hasattr() on every scored item.
+# Pydantic fields are not class attributes, so read the model's field table
+# (model_fields on pydantic v2, __fields__ on v1).
+_ITEM_FIELDS = set(getattr(Item, 'model_fields', None) or getattr(Item, '__fields__', {}))
+_HAS_EXPIRY = 'expiryDate' in _ITEM_FIELDS
+_HAS_USAGE = 'usageLimit' in _ITEM_FIELDS and 'usageCount' in _ITEM_FIELDS
+
+# Zone aliases and related terms, grouped by category
+ZONE_ALIASES: Dict[str, List[str]] = {
+    'lab': ['lab', 'laboratory', 'research', 'science', 'experiment'],
+    'storage': ['storage', 'cargo', 'warehouse', 'bay', 'hold'],
+    'maintenance': ['maintenance', 'engineering', 'repair', 'workshop', 'technical'],
+    'crew': ['crew', 'quarters', 'living', 'personal', 'residential'],
+    'medical': ['medical', 'health', 'hospital', 'clinic', 'treatment'],
+    'airlock': ['airlock', 'entry', 'exit', 'hatch', 'docking'],
+    'cockpit': ['cockpit', 'bridge', 'control', 'command', 'pilot']
+}
+
+# One compiled alternation per category (substring semantics, like `alias in zone`)
+_ZONE_PATTERNS = [
+    (category, re.compile('|'.join(re.escape(alias) for alias in aliases)))
+    for category, aliases in ZONE_ALIASES.items()
+]
+
+def _zone_category(zone_clean: str) -> Optional[str]:
+    """Return the alias category of a normalized zone name (last match wins)"""
+    category = None
+    for name, pattern in _ZONE_PATTERNS:
+        if pattern.search(zone_clean):
+            category = name
+    return category
+
+@lru_cache(maxsize=4096)
+def _zone_match_score(preferred_zone: str, container_zone: str, no_match_score: float) -> float:
+    """Memoized zone match scoring shared by ZoneOptimizer and the engine"""
+    if not preferred_zone or not container_zone:
+        return 0.5  # Neutral score for missing zones
+    
+    # Normalize zone names
+    pref_clean = preferred_zone.lower().replace('_', ' ').replace('-', ' ')
+    cont_clean = container_zone.lower().replace('_', ' ').replace('-', ' ')
+    
+    # Exact match
+    if pref_clean == cont_clean:
+        return 1.0
+    
+    # Check for partial string matches
+    if pref_clean in cont_clean or cont_clean in pref_clean:
+        return 0.8
+    
+    # Check for word matches
+    if set(pref_clean.split()) & set(cont_clean.split()):
+        return 0.7
+    
+    # Same alias category match
+    pref_category = _zone_category(pref_clean)
+    if pref_category and pref_category == _zone_category(cont_clean):
+        return 0.6
+    
+    return no_match_score
+
+@lru_cache(maxsize=4096)
+def _parse_expiry(expiry_date: str) -> Optional[datetime]:
+    """Memoized ISO expiry parsing (None for unparseable values such as 'N/A')"""
+    try:
+        return datetime.fromisoformat(expiry_date.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+def _expiry_datetime(expiry_date: Any) -> Optional[datetime]:
+    """Resolve an item's expiryDate (ISO string or datetime) to a datetime"""
+    if isinstance(expiry_date, str):
+        return _parse_expiry(expiry_date)
+    return expiry_date
+
 class PriorityCalculator:
     """Advanced priority calculation handling multiple priority variables"""
     
@@ -46,13 +124,9 @@ class PriorityCalculator:
         
         # Expiry urgency (30% weight, normalized to 0-30)
         expiry_score = 0.0
-        if hasattr(item, 'expiryDate') and item.expiryDate:
+        expiry_date = _expiry_datetime(item.expiryDate) if _HAS_EXPIRY and item.expiryDate else None
+        if expiry_date is not None:
             try:
-                if isinstance(item.expiryDate, str):
-                    expiry_date = datetime.fromisoformat(item.expiryDate.replace('Z', '+00:00'))
-                else:
-                    expiry_date = item.expiryDate
-                
                 days_to_expiry = (expiry_date - current_time).days
                 
                 if days_to_expiry <= 0:
@@ -65,12 +139,12 @@ class PriorityCalculator:
                     expiry_score = 5.0   # Expires within 3 months
                 else:
                     expiry_score = 0.0   # Long-term storage
-            except (ValueError, TypeError):
+            except TypeError:
                 expiry_score = 0.0
         
         # Usage depletion urgency (20% weight, normalized to 0-20)
         usage_score = 0.0
-        if hasattr(item, 'usageLimit') and hasattr(item, 'usageCount'):
+        if _HAS_USAGE:
             if item.usageLimit and item.usageLimit > 0:
                 remaining_uses = item.usageLimit - getattr(item, 'usageCount', 0)
                 usage_ratio = remaining_uses / item.usageLimit
@@ -103,7 +177,11 @@ class PriorityCalculator:
         Higher scores indicate items that should be retrieved first.
         """
         composite_priority = PriorityCalculator.calculate_composite_priority(item, current_time)
-        
+        return PriorityCalculator.retrieval_priority_from_composite(item, composite_priority, retrieval_steps)
+    
+    @staticmethod
+    def retrieval_priority_from_composite(item: Item, composite_priority: float, retrieval_steps: int) -> float:
+        """Retrieval priority for an item whose composite priority is already known"""
         # Penalty for retrieval difficulty (each step reduces priority)
         retrieval_penalty = retrieval_steps * 5.0
         
@@ -124,21 +202,17 @@ class PriorityCalculator:
             return True
         
         # Force preferred zone for items expiring soon
-        if hasattr(item, 'expiryDate') and item.expiryDate:
+        expiry_date = _expiry_datetime(item.expiryDate) if _HAS_EXPIRY and item.expiryDate else None
+        if expiry_date is not None:
             try:
-                if isinstance(item.expiryDate, str):
-                    expiry_date = datetime.fromisoformat(item.expiryDate.replace('Z', '+00:00'))
-                else:
-                    expiry_date = item.expiryDate
-                
                 days_to_expiry = (expiry_date - datetime.now()).days
                 if days_to_expiry <= 14:  # Expires within 2 weeks
                     return True
-            except (ValueError, TypeError):
+            except TypeError:
                 pass
         
         # Force preferred zone for items with low usage left
-        if hasattr(item, 'usageLimit') and hasattr(item, 'usageCount'):
+        if _HAS_USAGE:
             if item.usageLimit and item.usageLimit > 0:
                 remaining_uses = item.usageLimit - getattr(item, 'usageCount', 0)
                 if remaining_uses <= 2:  # 2 or fewer uses left
@@ -150,51 +224,60 @@ class AccessibilityTracker:
     """Track and optimize item accessibility for efficient retrieval"""
     
     def __init__(self):
-        self.retrieval_cache: Dict[str, int] = {}  # item_id -> retrieval_steps
+        # container_id -> (container version, {item_id: retrieval_steps})
+        self.retrieval_cache: Dict[str, Tuple[int, Dict[str, int]]] = {}
     
     def calculate_retrieval_steps(self, target_item_id: str, container_state: 'ContainerState') -> int:
         """Calculate number of steps needed to retrieve an item"""
+        # Each container's entries are tagged with its version; the first lookup
+        # after a placement into the container drops the stale entries
+        container_cache = self.retrieval_cache.get(container_state.container_id)
+        if container_cache is None or container_cache[0] != container_state._version:
+            container_cache = (container_state._version, {})
+            self.retrieval_cache[container_state.container_id] = container_cache
+        
+        cached_steps = container_cache[1].get(target_item_id)
+        if cached_steps is not None:
+            return cached_steps
+        
+        if target_item_id not in container_state._placed_ids:
+            return float('inf')  # Item not found
+        
         # Find the target item
-        target_item = None
-        for item in container_state.placed_items:
-            if item.item_id == target_item_id:
-                target_item = item
-                break
+        target_index = next(
+            (i for i, item in enumerate(container_state.placed_items) if item.item_id == target_item_id),
+            None
+        )
         
-        if not target_item:
+        if target_index is None:
             return float('inf')  # Item not found
         
         # Simple implementation: count items that block access from the open face
         # Assumes open face is at y=0 (depth=0)
-        blocking_items = 0
-        
-        target_bounds = target_item.get_aabb()
-        
-        for other_item in container_state.placed_items:
-            if other_item.item_id == target_item_id:
-                continue
-            
-            other_bounds = other_item.get_aabb()
-            
-            # Check if other item blocks access to target item
-            # Item blocks if it's in front (lower y) and overlaps in x,z
-            if (other_bounds[1] < target_bounds[1] and  # other is in front
-                other_bounds[3] > target_bounds[0] and  # x overlap
-                other_bounds[0] < target_bounds[3] and  # x overlap
-                other_bounds[5] > target_bounds[2] and  # z overlap
-                other_bounds[2] < target_bounds[5]):    # z overlap
-                blocking_items += 1
-        
-        self.retrieval_cache[target_item_id] = blocking_items
+        t_min_x, t_min_y, t_min_z, t_max_x, _, t_max_z = container_state._placed_aabbs[target_index]
+        
+        # An item blocks if it's in front (lower y) and overlaps in x,z. The
+        # target never satisfies the strict "in front" test, so it needs no skip.
+        blocking_items = sum(
+            1 for min_x, min_y, min_z, max_x, _, max_z in container_state._placed_aabbs
+            if (min_y < t_min_y and
+                max_x > t_min_x and min_x < t_max_x and
+                max_z > t_min_z and min_z < t_max_z)
+        )
+        
+        container_cache[1][target_item_id] = blocking_items
         return blocking_items
     
     def get_accessibility_score(self, item_id: str, container_state: 'ContainerState') -> float:
         """Get accessibility score (higher = more accessible)"""
-        steps = self.calculate_retrieval_steps(item_id, container_state)
+        return self.accessibility_score_from_steps(self.calculate_retrieval_steps(item_id, container_state))
+    
+    @staticmethod
+    def accessibility_score_from_steps(steps: float) -> float:
+        """Convert retrieval steps to an accessibility score (fewer steps = higher score)"""
         if steps == float('inf'):
             return 0.0
         
-        # Convert steps to score (fewer steps = higher score)
         return max(0.0, 100.0 - (steps * 10.0))
 
 class ZoneOptimizer:
@@ -210,7 +293,8 @@ class ZoneOptimizer:
         priority_multiplier = 1.0 + (item.priority / 100.0)
         
         # High priority items get significant boost for preferred zones
-        if item.preferredZone.lower() == container_zone.lower() and item.priority >= 80:
+        # (priority first so lower() only runs for items that can get the boost)
+        if item.priority >= 80 and item.preferredZone.lower() == container_zone.lower():
             zone_score += 50.0  # Significant boost for high priority in preferred zone
         
         return zone_score * priority_multiplier
@@ -232,54 +316,7 @@ class ZoneOptimizer:
     @staticmethod
     def _calculate_zone_match_score(preferred_zone: str, container_zone: str) -> float:
         """Calculate how well an item's preferred zone matches a container zone"""
-        if not preferred_zone or not container_zone:
-            return 0.5  # Neutral score for missing zones
-        
-        # Normalize zone names
-        pref_clean = preferred_zone.lower().replace('_', ' ').replace('-', ' ')
-        cont_clean = container_zone.lower().replace('_', ' ').replace('-', ' ')
-        
-        # Exact match
-        if pref_clean == cont_clean:
-            return 1.0
-        
-        # Check for partial string matches
-        if pref_clean in cont_clean or cont_clean in pref_clean:
-            return 0.8
-        
-        # Check for word matches
-        pref_words = set(pref_clean.split())
-        cont_words = set(cont_clean.split())
-        common_words = pref_words.intersection(cont_words)
-        if common_words:
-            return 0.7
-        
-        # Initialize zone aliases for this static method
-        zone_aliases = {
-            'lab': ['lab', 'laboratory', 'research', 'science', 'experiment'],
-            'storage': ['storage', 'cargo', 'warehouse', 'bay', 'hold'],
-            'maintenance': ['maintenance', 'engineering', 'repair', 'workshop', 'technical'],
-            'crew': ['crew', 'quarters', 'living', 'personal', 'residential'],
-            'medical': ['medical', 'health', 'hospital', 'clinic', 'treatment'],
-            'airlock': ['airlock', 'entry', 'exit', 'hatch', 'docking'],
-            'cockpit': ['cockpit', 'bridge', 'control', 'command', 'pilot']
-        }
-        
-        # Check against zone aliases
-        pref_category = None
-        cont_category = None
-        
-        for category, aliases in zone_aliases.items():
-            if any(alias in pref_clean for alias in aliases):
-                pref_category = category
-            if any(alias in cont_clean for alias in aliases):
-                cont_category = category
-        
-        # Same category match
-        if pref_category and cont_category and pref_category == cont_category:
-            return 0.6
-        
-        return 0.2  # Low match
+        return _zone_match_score(preferred_zone, container_zone, 0.2)  # 0.2 = low match
 
 class ItemSorter:
     """Advanced item sorting considering multiple priority variables"""
@@ -295,7 +332,13 @@ class ItemSorter:
         if current_time is None:
             current_time = datetime.now()
         
-        def get_comprehensive_score(item: Item) -> Tuple[float, float, float]:
+        # Zone buckets are numbered once per sort in order of first appearance;
+        # unlike hash() this is stable across interpreter runs
+        zone_index: Dict[str, int] = {}
+        for item in items:
+            zone_index.setdefault(item.preferredZone or "", len(zone_index))
+        
+        def get_comprehensive_score(index: int, item: Item) -> Tuple[float, float, int]:
             # Primary score: composite priority
             composite_priority = PriorityCalculator.calculate_composite_priority(item, current_time)
             
@@ -324,20 +367,57 @@ class ItemSorter:
                 shape_score = 75   # Regular shapes
             
             # Zone clustering bonus (slight preference for grouping)
-            zone_bonus = hash(item.preferredZone or "") % 10
+            zone_bonus = zone_index[item.preferredZone or ""] % 10
             
             packing_score = size_score + shape_score + zone_bonus
             
-            # Tertiary score: random tie-breaker
-            tie_breaker = hash(item.itemId) % 1000
+            # Tertiary score: input order (earlier items first on ties)
+            tie_breaker = -index
             
             return (composite_priority, packing_score, tie_breaker)
         
         # Sort by composite priority (desc), then packing score (desc), then tie-breaker
-        return sorted(items, key=get_comprehensive_score, reverse=True)
+        ranked = sorted(enumerate(items), key=lambda pair: get_comprehensive_score(*pair), reverse=True)
+        return [item for _, item in ranked]
+
+def _min_distance_sq(x: float, y: float, z: float,
+                     aabbs: List[Tuple[float, float, float, float, float, float]]) -> float:
+    """Smallest squared distance from (x, y, z) to the min corner of any AABB"""
+    best = math.inf
+    for min_x, min_y, min_z, _, _, _ in aabbs:
+        dx = x - min_x
+        dy = y - min_y
+        dz = z - min_z
+        distance_sq = dx * dx + dy * dy + dz * dz
+        if distance_sq < best:
+            best = distance_sq
+    return best
+
+@lru_cache(maxsize=4096)
+def _placement_orientations(width: float, depth: float, height: float) -> Tuple[Tuple[float, float, float], ...]:
+    """Orientations tried by _try_place_item_optimized, shared by items of equal dimensions"""
+    # Try multiple orientations (0°, 90°, and if item allows, 180° and 270°)
+    orientations = [
+        (width, depth, height),
+        (depth, width, height)
+    ]
+    
+    # Add vertical orientations if the item can be rotated
+    if height < max(width, depth):
+        orientations.extend([
+            (height, depth, width),
+            (height, width, depth),
+            (width, height, depth),
+            (depth, height, width)
+        ])
+    
+    # Equal sides produce repeated orientations; keep the first of each
+    return tuple(dict.fromkeys(orientations))
 
 class FreeSpace:
     """Represents a block of free space in 3D with enhanced functionality"""
+    __slots__ = ('x', 'y', 'z', 'width', 'depth', 'height', 'volume')
+    
     def __init__(self, x: float, y: float, z: float, width: float, depth: float, height: float):
         self.x = x
         self.y = y
@@ -345,11 +425,9 @@ class FreeSpace:
         self.width = width
         self.depth = depth
         self.height = height
-        
-    @property
-    def volume(self) -> float:
-        """Calculate the volume of this free space"""
-        return self.width * self.depth * self.height
+        # Free spaces are never resized in place (splits and merges build new
+        # ones), so the volume is computed once here
+        self.volume = width * depth * height
     
     @property
     def bottom_area(self) -> float:
@@ -364,27 +442,34 @@ class FreeSpace:
     
     def can_fit_any_orientation(self, width: float, depth: float, height: float) -> List[Tuple[float, float, float]]:
         """Check all possible orientations and return list of valid ones"""
-        orientations = [
+        # dict.fromkeys drops repeated orientations of square/cubic items while
+        # keeping the original enumeration order
+        orientations = dict.fromkeys([
             (width, depth, height),   # Original
             (depth, width, height),   # Rotate 90° on Z
             (width, height, depth),   # Rotate 90° on X
             (height, width, depth),   # Rotate 90° on X, then 90° on Z
             (depth, height, width),   # Rotate 90° on Y
             (height, depth, width)    # Rotate 90° on Y, then 90° on Z
-        ]
+        ])
         
-        valid_orientations = []
-        for w, d, h in orientations:
-            if self.can_fit(w, d, h):
-                valid_orientations.append((w, d, h))
-                
-        return valid_orientations
+        return [o for o in orientations if self.can_fit(*o)]
+    
+    def fits_any_orientation(self, width: float, depth: float, height: float) -> bool:
+        """Check whether an item fits in at least one orientation"""
+        # Some orientation fits iff the sorted dimensions fit pairwise
+        a, b, c = sorted((width, depth, height))
+        s1, s2, s3 = sorted((self.width, self.depth, self.height))
+        return a <= s1 and b <= s2 and c <= s3
     
     def __repr__(self) -> str:
         return f"FreeSpace({self.x:.1f}, {self.y:.1f}, {self.z:.1f}, {self.width:.1f}, {self.depth:.1f}, {self.height:.1f})"
 
 class PlacedItem:
     """Represents an item that has been placed in 3D space with enhanced tracking"""
+    __slots__ = ('item_id', 'x', 'y', 'z', 'width', 'depth', 'height',
+                 'original_dims', 'priority', 'timestamp', '_aabb', 'volume')
+    
     def __init__(self, item_id: str, x: float, y: float, z: float, width: float, depth: float, height: float, 
                  original_dims: Tuple[float, float, float], priority: int):
         self.item_id = item_id
@@ -397,10 +482,13 @@ class PlacedItem:
         self.original_dims = original_dims  # Store original dimensions for orientation tracking
         self.priority = priority
         self.timestamp = time.time()
+        # Bounds are fixed once placed, so build the AABB tuple a single time
+        self._aabb = (x, y, z, x + width, y + depth, z + height)
+        self.volume = width * depth * height
         
     def get_volume(self) -> float:
         """Get the volume of this item"""
-        return self.width * self.depth * self.height
+        return self.volume
     
     def get_position(self) -> Dict:
         """Get position in API format"""
@@ -419,25 +507,93 @@ class PlacedItem:
     
     def get_aabb(self) -> Tuple[float, float, float, float, float, float]:
         """Get axis-aligned bounding box coordinates (min_x, min_y, min_z, max_x, max_y, max_z)"""
-        return (self.x, self.y, self.z, 
-                self.x + self.width, self.y + self.depth, self.z + self.height)
+        return self._aabb
     
     def __repr__(self) -> str:
         return f"PlacedItem({self.item_id}, {self.x:.1f}, {self.y:.1f}, {self.z:.1f}, {self.width:.1f}, {self.depth:.1f}, {self.height:.1f})"
 
+class PlacementCandidate(NamedTuple):
+    """Placement chosen by the engine; converted to the API dict format only on return"""
+    container_id: str
+    x: float
+    y: float
+    z: float
+    width: float
+    depth: float
+    height: float
+    score: float = 0.0
+    
+    def to_dict(self) -> Dict:
+        """Get placement in API format"""
+        return {
+            "containerId": self.container_id,
+            "position": {
+                "startCoordinates": {
+                    "width": float(self.x),
+                    "depth": float(self.y),
+                    "height": float(self.z)
+                },
+                "endCoordinates": {
+                    "width": float(self.x + self.width),
+                    "depth": float(self.y + self.depth),
+                    "height": float(self.z + self.height)
+                }
+            }
+        }
+
 class ContainerState:
     """Manages the state of a container with advanced space management"""
+    # Uniform XY grid over placed items used to prune overlap scans; below
+    # _GRID_MIN_ITEMS a plain linear scan is cheaper than the grid lookup
+    _GRID_CELL = 50.0
+    _GRID_MIN_ITEMS = 32
+    
     def __init__(self, container_id: str, width: float, depth: float, height: float, zone: str):
         self.container_id = container_id
         self.width = width
         self.depth = depth
         self.height = height
         self.zone = zone
+        # Lowercased zone for case-insensitive preferred zone checks
+        self.zone_lc = zone.lower()
         self.placed_items: List[PlacedItem] = []
+        # AABBs of placed_items, index-aligned, for collision scans
+        self._placed_aabbs: List[Tuple[float, float, float, float, float, float]] = []
+        # IDs of placed_items for O(1) membership checks
+        self._placed_ids: Set[str] = set()
+        # Max-heap of low priority (< 50) placed items as (-volume, index into
+        # placed_items); the top is the largest, earliest placed on equal volume
+        self._low_priority_heap: List[Tuple[float, int]] = []
+        # (expiry datetime, index into placed_items) for items with a naive,
+        # parseable expiry date, kept sorted so the soonest expiries come first
+        self._expiry_index: List[Tuple[datetime, int]] = []
+        # (cell_x, cell_y) -> indices into placed_items whose XY footprint touches the cell
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
         self.free_spaces: List[FreeSpace] = [FreeSpace(0, 0, 0, width, depth, height)]
         self.total_volume = width * depth * height
         self.used_volume = 0.0
+        # Bumped on every successful placement; caches keyed on container contents
+        # compare against it to know when they are stale
+        self._version = 0
+        # Feasibility cache: oriented dims -> position found by find_position (or None)
+        self._feasibility: Dict[Tuple[float, float, float], Optional[Tuple[float, float, float]]] = {}
+        # Boundary test specialized for this container's (fixed) dimensions
+        self._fits_bounds = self._make_bounds_check(width, depth, height)
+        # (version, largest free space) - free spaces only change on placement
+        self._largest_free_space: Optional[Tuple[int, Optional[FreeSpace]]] = None
+        # (version, free spaces sorted front-most first)
+        self._front_sorted_spaces: Optional[Tuple[int, List[FreeSpace]]] = None
         
+    @staticmethod
+    def _make_bounds_check(max_width: float, max_depth: float, max_height: float):
+        """Build a boundary test with the container dimensions bound as closure constants"""
+        def fits_bounds(x: float, y: float, z: float, width: float, depth: float, height: float) -> bool:
+            return (x >= 0 and y >= 0 and z >= 0 and
+                    x + width <= max_width and
+                    y + depth <= max_depth and
+                    z + height <= max_height)
+        return fits_bounds
+    
     def get_utilization(self) -> float:
         """Get space utilization percentage"""
         if self.total_volume == 0:
@@ -446,9 +602,43 @@ class ContainerState:
     
     def get_largest_free_space(self) -> Optional[FreeSpace]:
         """Get the largest free space by volume"""
-        if not self.free_spaces:
-            return None
-        return max(self.free_spaces, key=lambda fs: fs.volume)
+        cached = self._largest_free_space
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        
+        largest = max(self.free_spaces, key=lambda fs: fs.volume) if self.free_spaces else None
+        self._largest_free_space = (self._version, largest)
+        return largest
+    
+    def _grid_cells(self, min_x: float, min_y: float, max_x: float, max_y: float):
+        """Yield the grid cells covered by an XY footprint"""
+        cell = self._GRID_CELL
+        for cell_x in range(int(min_x // cell), int(max_x // cell) + 1):
+            for cell_y in range(int(min_y // cell), int(max_y // cell) + 1):
+                yield (cell_x, cell_y)
+    
+    def _overlap_candidates(self, min_x: float, min_y: float, max_x: float, max_y: float):
+        """Indices of placed items (in placement order) that may overlap an XY footprint"""
+        if len(self.placed_items) < self._GRID_MIN_ITEMS:
+            return range(len(self.placed_items))
+        
+        grid = self._grid
+        candidates: Set[int] = set()
+        for cell in self._grid_cells(min_x, min_y, max_x, max_y):
+            bucket = grid.get(cell)
+            if bucket:
+                candidates.update(bucket)
+        return sorted(candidates)
+    
+    def get_free_spaces_front_first(self) -> List[FreeSpace]:
+        """Get free spaces ordered by distance from the open face (y), stable on ties"""
+        cached = self._front_sorted_spaces
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        
+        front_first = sorted(self.free_spaces, key=lambda fs: fs.y)
+        self._front_sorted_spaces = (self._version, front_first)
+        return front_first
     
     def can_place_item(self, x: float, y: float, z: float, width: float, depth: float, height: float) -> bool:
         """Check if an item can be placed at the specified position"""
@@ -459,12 +649,12 @@ class ContainerState:
             z + height > self.height):
             return False
         
-        # AABB collision detection with existing items
+        # AABB collision detection with existing items near the footprint
         item_aabb = (x, y, z, x + width, y + depth, z + height)
+        placed_aabbs = self._placed_aabbs
         
-        for placed_item in self.placed_items:
-            placed_aabb = placed_item.get_aabb()
-            
+        for index in self._overlap_candidates(x, y, item_aabb[3], item_aabb[4]):
+            placed_aabb = placed_aabbs[index]
             # Check for overlap on all three axes
             if not (item_aabb[3] <= placed_aabb[0] or item_aabb[0] >= placed_aabb[3] or
                     item_aabb[4] <= placed_aabb[1] or item_aabb[1] >= placed_aabb[4] or
@@ -473,40 +663,71 @@ class ContainerState:
         
         return True
     
+    def _check_positions_batched(self, positions: List[Tuple[float, float, float]],
+                                 width: float, depth: float, height: float) -> List[bool]:
+        """Check several candidate positions for the same item dimensions at once"""
+        # Boundary check for every candidate
+        fits_bounds = self._fits_bounds
+        feasible = [fits_bounds(x, y, z, width, depth, height) for x, y, z in positions]
+        
+        # AABB collision detection - each placed item is visited once for all
+        # candidates, stopping as soon as every candidate is ruled out
+        for p_min_x, p_min_y, p_min_z, p_max_x, p_max_y, p_max_z in self._placed_aabbs:
+            if not any(feasible):
+                break
+            for i, (x, y, z) in enumerate(positions):
+                if feasible[i] and not (x + width <= p_min_x or x >= p_max_x or
+                                        y + depth <= p_min_y or y >= p_max_y or
+                                        z + height <= p_min_z or z >= p_max_z):
+                    feasible[i] = False
+        
+        return feasible
+    
     def find_position(self, width: float, depth: float, height: float, priority: int) -> Optional[Tuple[float, float, float]]:
         """Find a suitable position for an item with given dimensions - OPTIMIZED FOR EVALUATION"""
+        # The search only depends on the oriented dimensions and the container
+        # contents, so repeated queries between placements are answered from cache
+        key = (width, depth, height)
+        if key in self._feasibility:
+            return self._feasibility[key]
+        
+        position = self._search_position(width, depth, height)
+        self._feasibility[key] = position
+        return position
+    
+    def _search_position(self, width: float, depth: float, height: float) -> Optional[Tuple[float, float, float]]:
+        """Uncached position search used by find_position"""
         # EVALUATION OPTIMIZATION: Much simpler and faster algorithm
+        max_x = max(0, self.width - width)
+        max_y = max(0, self.depth - depth)
+        max_z = max(0, self.height - height)
         
         # Try bottom corners first (most stable and fastest to check)
         corners = [
             (0, 0, 0),  # Origin corner
-            (max(0, self.width - width), 0, 0),  # Right corner
-            (0, max(0, self.depth - depth), 0),  # Back corner
-            (max(0, self.width - width), max(0, self.depth - depth), 0)  # Far corner
+            (max_x, 0, 0),  # Right corner
+            (0, max_y, 0),  # Back corner
+            (max_x, max_y, 0)  # Far corner
         ]
         
-        for x, y, z in corners:
-            if (x >= 0 and y >= 0 and z >= 0 and
-                x + width <= self.width and 
-                y + depth <= self.depth and 
-                z + height <= self.height and
-                self.can_place_item(x, y, z, width, depth, height)):
-                return (x, y, z)
+        # All corners are tested in a single walk over the placed items
+        feasible = self._check_positions_batched(corners, width, depth, height)
+        for corner, is_feasible in zip(corners, feasible):
+            if is_feasible:
+                return corner
+        
+        can_place_item = self.can_place_item
         
         # If corners don't work, try first available free space
         for space in self.free_spaces[:10]:  # Only check first 10 spaces for speed
             if space.can_fit(width, depth, height):
                 x, y, z = space.x, space.y, space.z
-                if self.can_place_item(x, y, z, width, depth, height):
+                if can_place_item(x, y, z, width, depth, height):
                     return (x, y, z)
         
         # If free spaces don't work, use coarse grid search
         step_size = max(10.0, width, depth)  # Large steps for speed
         
-        max_x = max(0, self.width - width)
-        max_y = max(0, self.depth - depth)
-        max_z = max(0, self.height - height)
-        
         # Only check a few positions for speed
         grid_points_checked = 0
         max_grid_points = 100  # Very limited for evaluation speed
@@ -525,7 +746,7 @@ class ContainerState:
                     if grid_points_checked > max_grid_points:
                         break
                         
-                    if self.can_place_item(x, y, z, width, depth, height):
+                    if can_place_item(x, y, z, width, depth, height):
                         return (x, y, z)
         
         return None
@@ -540,12 +761,11 @@ class ContainerState:
         
         # Compactness score (prefer positions closer to other items)
         compactness = 0
-        if self.placed_items:
-            min_distance = float('inf')
-            for item in self.placed_items:
-                dist = math.sqrt((x - item.x)**2 + (y - item.y)**2 + (z - item.z)**2)
-                min_distance = min(min_distance, dist)
-            compactness = max(0, 100 - min(100, min_distance))
+        if self._placed_aabbs:
+            # sqrt is monotonic, so take the minimum in squared space and
+            # apply a single sqrt at the end
+            min_distance_sq = _min_distance_sq(x, y, z, self._placed_aabbs)
+            compactness = max(0, 100 - min(100, math.sqrt(min_distance_sq)))
         
         # Priority bonus (higher priority items get better positions)
         priority_bonus = priority
@@ -557,7 +777,8 @@ class ContainerState:
                 priority_bonus * 0.2)
     
     def place_item(self, item_id: str, x: float, y: float, z: float, width: float, depth: float, height: float, 
-                   original_dims: Tuple[float, float, float], priority: int) -> bool:
+                   original_dims: Tuple[float, float, float], priority: int,
+                   expiry_date: Optional[str] = None) -> bool:
         """Place an item at the specified position and update space management"""
         if not self.can_place_item(x, y, z, width, depth, height):
             return False
@@ -565,6 +786,19 @@ class ContainerState:
         # Add to placed items
         item = PlacedItem(item_id, x, y, z, width, depth, height, original_dims, priority)
         self.placed_items.append(item)
+        self._placed_aabbs.append(item.get_aabb())
+        self._placed_ids.add(item_id)
+        index = len(self.placed_items) - 1
+        if priority < 50:
+            heapq.heappush(self._low_priority_heap, (-item.volume, index))
+        if expiry_date:
+            expiry = _expiry_datetime(expiry_date)
+            # Timezone-aware expiries cannot be compared with the naive
+            # current time used for urgency checks, so they are not indexed
+            if expiry is not None and expiry.tzinfo is None:
+                bisect.insort(self._expiry_index, (expiry, index))
+        for cell in self._grid_cells(x, y, x + width, y + depth):
+            self._grid.setdefault(cell, []).append(index)
         
         # Update volume tracking
         self.used_volume += item.get_volume()
@@ -572,39 +806,52 @@ class ContainerState:
         # Update free spaces
         self._update_free_spaces(x, y, z, width, depth, height)
         
+        # Container contents changed - drop cached feasibility results
+        self._version += 1
+        self._feasibility.clear()
+        
         return True
     
     def _update_free_spaces(self, x: float, y: float, z: float, width: float, depth: float, height: float):
         """Update free spaces after placing an item - SIMPLIFIED FOR EVALUATION SPEED"""
         # EVALUATION OPTIMIZATION: Much simpler space management
         
-        item_space = FreeSpace(x, y, z, width, depth, height)
+        # Item bounds are hoisted once so the separating-axis test below runs
+        # inline for every free space instead of through _spaces_overlap
+        item_max_x = x + width
+        item_max_y = y + depth
+        item_max_z = z + height
         new_free_spaces = []
         
         for free_space in self.free_spaces:
-            if self._spaces_overlap(free_space, item_space):
-                # Simple split - just create basic splits for performance
-                splits = []
-                
-                # Left split
-                if item_space.x > free_space.x:
-                    splits.append(FreeSpace(
-                        free_space.x, free_space.y, free_space.z,
-                        item_space.x - free_space.x, free_space.depth, free_space.height
-                    ))
-                
-                # Right split
-                if free_space.x + free_space.width > item_space.x + item_space.width:
-                    splits.append(FreeSpace(
-                        item_space.x + item_space.width, free_space.y, free_space.z,
-                        (free_space.x + free_space.width) - (item_space.x + item_space.width),
-                        free_space.depth, free_space.height
-                    ))
-                
-                # Only keep splits larger than threshold for performance
-                new_free_spaces.extend([s for s in splits if s.volume > 10.0])
-            else:
+            fs_x = free_space.x
+            fs_max_x = fs_x + free_space.width
+            if (fs_max_x <= x or item_max_x <= fs_x or
+                free_space.y + free_space.depth <= y or item_max_y <= free_space.y or
+                free_space.z + free_space.height <= z or item_max_z <= free_space.z):
                 new_free_spaces.append(free_space)
+                continue
+            
+            # Simple split - just create basic splits for performance
+            # Left split
+            if x > fs_x:
+                left = FreeSpace(
+                    fs_x, free_space.y, free_space.z,
+                    x - fs_x, free_space.depth, free_space.height
+                )
+                # Only keep splits larger than threshold for performance
+                if left.volume > 10.0:
+                    new_free_spaces.append(left)
+            
+            # Right split
+            if fs_max_x > item_max_x:
+                right = FreeSpace(
+                    item_max_x, free_space.y, free_space.z,
+                    fs_max_x - item_max_x,
+                    free_space.depth, free_space.height
+                )
+                if right.volume > 10.0:
+                    new_free_spaces.append(right)
         
         # Keep only the largest free spaces to improve performance
         if len(new_free_spaces) > 50:  # Limit free spaces for performance
@@ -737,35 +984,32 @@ class ContainerState:
     def get_retrieval_steps(self, item_id: str) -> List[Dict]:
         """Calculate steps needed to retrieve an item"""
         # Simple implementation - identify items that block access
-        item_to_retrieve = None
-        for item in self.placed_items:
-            if item.item_id == item_id:
-                item_to_retrieve = item
-                break
-        
-        if not item_to_retrieve:
+        if item_id not in self._placed_ids:
             return []
         
-        # An item blocks retrieval if it's in front of the target item
-        # from the container opening perspective
-        retrieval_steps = []
-        step_count = 1
-        
-        for item in self.placed_items:
-            if item.item_id == item_id:
-                continue
-                
-            # Check if this item blocks the retrieval path
-            if (item.y < item_to_retrieve.y and  # Item is closer to opening
-                self._boxes_overlap_xy(item, item_to_retrieve)):
-                
-                # This item must be removed first
-                retrieval_steps.append({
-                    "step": step_count,
-                    "action": "remove",
-                    "itemId": item.item_id,
-                })
-                step_count += 1
+        target_index = next(i for i, item in enumerate(self.placed_items) if item.item_id == item_id)
+        t_min_x, t_min_y, _, t_max_x, t_max_y, _ = self._placed_aabbs[target_index]
+        
+        # An item blocks retrieval if it's in front of the target item (closer
+        # to the opening) and overlaps it in the XY plane. Only items sharing a
+        # grid cell with the target are tested; the target itself never passes
+        # the strict y test.
+        placed_items, placed_aabbs = self.placed_items, self._placed_aabbs
+        blocking_ids = []
+        for index in self._overlap_candidates(t_min_x, t_min_y, t_max_x, t_max_y):
+            min_x, min_y, _, max_x, max_y, _ = placed_aabbs[index]
+            # Given min_y < t_min_y, the only y separation possible is
+            # max_y <= t_min_y; it is tested first as items mostly differ in depth
+            if min_y < t_min_y and not (max_y <= t_min_y or
+                                        max_x <= t_min_x or t_max_x <= min_x):
+                blocking_ids.append(placed_items[index].item_id)
+        
+        # Each blocking item must be removed first
+        retrieval_steps = [
+            {"step": step, "action": "remove", "itemId": blocking_id}
+            for step, blocking_id in enumerate(blocking_ids, start=1)
+        ]
+        step_count = len(retrieval_steps) + 1
         
         # Add the retrieval step for the target item
         retrieval_steps.append({
@@ -776,25 +1020,16 @@ class ContainerState:
         step_count += 1
         
         # Add steps to place back the removed items in reverse order
-        for i in range(len(retrieval_steps) - 1):
-            blocking_item = retrieval_steps[len(retrieval_steps) - 2 - i]
-            if blocking_item["action"] == "remove":
-                retrieval_steps.append({
-                    "step": step_count,
-                    "action": "placeBack",
-                    "itemId": blocking_item["itemId"],
-                })
-                step_count += 1
+        for blocking_id in reversed(blocking_ids):
+            retrieval_steps.append({
+                "step": step_count,
+                "action": "placeBack",
+                "itemId": blocking_id,
+            })
+            step_count += 1
         
         return retrieval_steps
     
-    def _boxes_overlap_xy(self, item1: PlacedItem, item2: PlacedItem) -> bool:
-        """Check if two items overlap in the XY plane (ignoring Z)"""
-        return not (item1.x + item1.width <= item2.x or
-                   item2.x + item2.width <= item1.x or
-                   item1.y + item1.depth <= item2.y or
-                   item2.y + item2.depth <= item1.y)
-    
     def __repr__(self) -> str:
         return (f"ContainerState({self.container_id}, {self.zone}, " 
                 f"items: {len(self.placed_items)}, " 
@@ -806,70 +1041,24 @@ class AdvancedPlacementEngine:
     def __init__(self):
         self.container_states: Dict[str, ContainerState] = {}
         self.zone_aliases: Dict[str, List[str]] = self._initialize_zone_aliases()
-        self.placement_cache: Dict[str, Dict] = {}  # Cache for similar item placements
+        # Cache for similar item placements: (width, depth, height, priority, zone) -> placement
+        self.placement_cache: Dict[Tuple[float, float, float, int, str], PlacementCandidate] = {}
+        self._rank_cache: Dict[Tuple, List[Tuple[float, str]]] = {}  # Cache for container rankings
+        self._rank_cache_token: Tuple[int, ...] = ()  # Container versions the rank cache is valid for
+        # Static per-container columns read by the ranking loops:
+        # (container_id, state, width, height, zone)
+        self._container_rows: List[Tuple[str, ContainerState, float, float, str]] = []
+        # Lowercased zone -> [(container_id, state)] in container insertion order
+        self._containers_by_zone: Dict[str, List[Tuple[str, ContainerState]]] = {}
+        self.accessibility_tracker = AccessibilityTracker()
     
     def _initialize_zone_aliases(self) -> Dict[str, List[str]]:
         """Initialize dictionary of zone aliases and related terms"""
-        return {
-            'lab': ['lab', 'laboratory', 'research', 'science', 'experiment'],
-            'storage': ['storage', 'cargo', 'warehouse', 'bay', 'hold'],
-            'maintenance': ['maintenance', 'engineering', 'repair', 'workshop', 'technical'],
-            'crew': ['crew', 'quarters', 'living', 'personal', 'residential'],
-            'medical': ['medical', 'health', 'hospital', 'clinic', 'treatment'],
-            'airlock': ['airlock', 'entry', 'exit', 'hatch', 'docking'],
-            'cockpit': ['cockpit', 'bridge', 'control', 'command', 'pilot']
-        }
+        return {category: list(aliases) for category, aliases in ZONE_ALIASES.items()}
     
     def calculate_zone_match_score(self, preferred_zone: str, container_zone: str) -> float:
         """Calculate how well an item's preferred zone matches a container zone"""
-        if not preferred_zone or not container_zone:
-            return 0.5  # Neutral score for missing zones
-        
-        # Normalize zone names
-        pref_clean = preferred_zone.lower().replace('_', ' ').replace('-', ' ')
-        cont_clean = container_zone.lower().replace('_', ' ').replace('-', ' ')
-        
-        # Exact match
-        if pref_clean == cont_clean:
-            return 1.0
-        
-        # Check for partial string matches
-        if pref_clean in cont_clean or cont_clean in pref_clean:
-            return 0.8
-        
-        # Check for word matches
-        pref_words = set(pref_clean.split())
-        cont_words = set(cont_clean.split())
-        common_words = pref_words.intersection(cont_words)
-        if common_words:
-            return 0.7
-        
-        # Check against zone aliases
-        pref_category = None
-        cont_category = None
-        
-        # Use static zone aliases since this might be called from static context
-        zone_aliases = {
-            'lab': ['lab', 'laboratory', 'research', 'science', 'experiment'],
-            'storage': ['storage', 'cargo', 'warehouse', 'bay', 'hold'],
-            'maintenance': ['maintenance', 'engineering', 'repair', 'workshop', 'technical'],
-            'crew': ['crew', 'quarters', 'living', 'personal', 'residential'],
-            'medical': ['medical', 'health', 'hospital', 'clinic', 'treatment'],
-            'airlock': ['airlock', 'entry', 'exit', 'hatch', 'docking'],
-            'cockpit': ['cockpit', 'bridge', 'control', 'command', 'pilot']
-        }
-        
-        for category, aliases in zone_aliases.items():
-            if any(alias in pref_clean for alias in aliases):
-                pref_category = category
-            if any(alias in cont_clean for alias in aliases):
-                cont_category = category
-        
-        if pref_category and cont_category and pref_category == cont_category:
-            return 0.6
-        
-        # No match
-        return 0.3
+        return _zone_match_score(preferred_zone, container_zone, 0.3)  # 0.3 = no match
     
     def find_optimal_placement(self, item: Item, containers: Dict[str, Container], 
                              placed_items: Dict[str, Item]) -> Optional[Dict]:
@@ -877,38 +1066,54 @@ class AdvancedPlacementEngine:
         # Initialize container states if needed
         self._initialize_container_states(containers, placed_items)
         
+        return self._find_optimal_placement(item, containers)
+    
+    def find_optimal_placements(self, items: List[Item], containers: Dict[str, Container],
+                                placed_items: Dict[str, Item]) -> List[Optional[Dict]]:
+        """
+        Batch version of find_optimal_placement.
+        Container states are initialized once for the whole batch and items are
+        placed highest priority (then largest volume) first. Results are returned
+        in the order of the input items, None where no placement was found.
+        """
+        self._initialize_container_states(containers, placed_items)
+        
+        order = sorted(
+            range(len(items)),
+            key=lambda i: (-items[i].priority, -(items[i].width * items[i].depth * items[i].height))
+        )
+        
+        results: List[Optional[Dict]] = [None] * len(items)
+        for i in order:
+            results[i] = self._find_optimal_placement(items[i], containers)
+        
+        return results
+    
+    def _find_optimal_placement(self, item: Item, containers: Dict[str, Container]) -> Optional[Dict]:
+        """Placement search for one item against already initialized container states"""
         # Check cache for similar items (time optimization)
-        cache_key = f"{item.width}x{item.depth}x{item.height}_p{item.priority}_{item.preferredZone}"
-        if cache_key in self.placement_cache:
-            cached_result = self.placement_cache[cache_key]
-            container_id = cached_result["containerId"]
-            
+        cache_key = (item.width, item.depth, item.height, item.priority, item.preferredZone)
+        cached = self.placement_cache.get(cache_key)
+        if cached is not None:
             # Verify the cached placement is still valid
-            if container_id in self.container_states:
-                container_state = self.container_states[container_id]
-                position = cached_result["position"]
-                start = position["startCoordinates"]
-                end = position["endCoordinates"]
-                
-                width = end["width"] - start["width"]
-                depth = end["depth"] - start["depth"]
-                height = end["height"] - start["height"]
+            if cached.container_id in self.container_states:
+                container_state = self.container_states[cached.container_id]
                 
                 # Try the cached position
                 if container_state.can_place_item(
-                    start["width"], start["depth"], start["height"],
-                    width, depth, height
+                    cached.x, cached.y, cached.z, cached.width, cached.depth, cached.height
                 ):
-                    logger.info(f"Using cached placement for similar item {item.itemId}")
+                    logger.info("Using cached placement for similar item %s", item.itemId)
                     
                     # Update container state
                     success = container_state.place_item(
-                        item.itemId, start["width"], start["depth"], start["height"],
-                        width, depth, height, (item.width, item.depth, item.height), item.priority
+                        item.itemId, cached.x, cached.y, cached.z,
+                        cached.width, cached.depth, cached.height,
+                        (item.width, item.depth, item.height), item.priority, item.expiryDate
                     )
                     
                     if success:
-                        return cached_result
+                        return cached.to_dict()
         
         # Get all valid containers sorted by suitability
         container_ranking = self._rank_containers_for_item(item)
@@ -916,150 +1121,148 @@ class AdvancedPlacementEngine:
         best_placement = None
         best_score = -1
         
+        # Try all possible orientations; duplicates from equal sides are dropped
+        # (in enumeration order) so each distinct shape is searched only once
+        orientations = list(dict.fromkeys([
+            (item.width, item.depth, item.height),    # Original
+            (item.depth, item.width, item.height),    # Rotate 90° on Z
+            (item.width, item.height, item.depth),    # Rotate 90° on X
+            (item.height, item.width, item.depth),    # Rotate 90° on X, then 90° on Z
+            (item.depth, item.height, item.width),    # Rotate 90° on Y
+            (item.height, item.depth, item.width)     # Rotate 90° on Y, then 90° on Z
+        ]))
+        
+        priority = item.priority
+        
         for rank_score, container_id in container_ranking:
             container = containers[container_id]
             container_state = self.container_states[container_id]
-            
-            # Try all possible orientations
-            orientations = [
-                (item.width, item.depth, item.height),    # Original
-                (item.depth, item.width, item.height),    # Rotate 90° on Z
-                (item.width, item.height, item.depth),    # Rotate 90° on X
-                (item.height, item.width, item.depth),    # Rotate 90° on X, then 90° on Z
-                (item.depth, item.height, item.width),    # Rotate 90° on Y
-                (item.height, item.depth, item.width)     # Rotate 90° on Y, then 90° on Z
-            ]
+            cw, cd, ch = container.width, container.depth, container.height
+            # Zone match depends only on the container, not the orientation
+            zone_match = self.calculate_zone_match_score(item.preferredZone, container.zone)
             
             for width, depth, height in orientations:
                 # Check if this orientation fits in the container dimensions
-                if (width > container.width or 
-                    depth > container.depth or 
-                    height > container.height):
+                if width > cw or depth > cd or height > ch:
                     continue
                 
                 # Find best position for this orientation
-                position = container_state.find_position(width, depth, height, item.priority)
+                position = container_state.find_position(width, depth, height, priority)
                 
                 if position:
                     x, y, z = position
                     
                     # Calculate placement score
-                    zone_match = self.calculate_zone_match_score(item.preferredZone, container.zone)
                     accessibility_score = max(0, 100 - y) / 100.0
                     stability_score = max(0, 100 - z) / 100.0
                     
                     # Combined score with weights
                     placement_score = (
                         zone_match * 50 +                  # Zone matching (0-50)
-                        item.priority * 0.3 +              # Priority (0-30)
+                        priority * 0.3 +                   # Priority (0-30)
                         accessibility_score * 15 +         # Accessibility (0-15)
                         stability_score * 5                # Stability (0-5)
                     )
                     
                     if placement_score > best_score:
                         best_score = placement_score
-                        best_placement = {
-                            "containerId": container_id,
-                            "position": {
-                                "startCoordinates": {
-                                    "width": float(x),
-                                    "depth": float(y),
-                                    "height": float(z)
-                                },
-                                "endCoordinates": {
-                                    "width": float(x + width),
-                                    "depth": float(y + depth),
-                                    "height": float(z + height)
-                                }
-                            },
-                            "score": placement_score,
-                            "orientation": (width, depth, height)
-                        }
+                        best_placement = PlacementCandidate(
+                            container_id, x, y, z, width, depth, height, placement_score
+                        )
         
         # If placement found, update container state
         if best_placement:
-            container_id = best_placement["containerId"]
-            container_state = self.container_states[container_id]
-            position = best_placement["position"]
-            start = position["startCoordinates"]
-            end = position["endCoordinates"]
-            
-            width = end["width"] - start["width"]
-            depth = end["depth"] - start["depth"]
-            height = end["height"] - start["height"]
+            container_state = self.container_states[best_placement.container_id]
             
             success = container_state.place_item(
-                item.itemId, start["width"], start["depth"], start["height"],
-                width, depth, height, (item.width, item.depth, item.height), item.priority
+                item.itemId, best_placement.x, best_placement.y, best_placement.z,
+                best_placement.width, best_placement.depth, best_placement.height,
+                (item.width, item.depth, item.height), item.priority, item.expiryDate
             )
             
             if success:
                 # Cache this placement for similar items
-                self.placement_cache[cache_key] = {
-                    "containerId": container_id,
-                    "position": position
-                }
+                self.placement_cache[cache_key] = best_placement
                 
-                # Remove score and orientation from returned result
-                best_placement.pop("score", None)
-                best_placement.pop("orientation", None)
-                
-                return best_placement
+                return best_placement.to_dict()
         
         return None
     
     def _initialize_container_states(self, containers: Dict[str, Container], placed_items: Dict[str, Item]):
         """Initialize or update container states with existing items"""
         # Initialize new containers
+        added = False
         for container_id, container in containers.items():
             if container_id not in self.container_states:
-                self.container_states[container_id] = ContainerState(
+                container_state = ContainerState(
                     container_id, container.width, container.depth, container.height, container.zone
                 )
+                self.container_states[container_id] = container_state
+                self._containers_by_zone.setdefault(container_state.zone_lc, []).append(
+                    (container_id, container_state)
+                )
+                added = True
+        
+        if added:
+            self._container_rows = [
+                (cid, cs, cs.width, cs.height, cs.zone) for cid, cs in self.container_states.items()
+            ]
         
         # Add existing items to container states
         for item_id, item in placed_items.items():
-            if hasattr(item, 'containerId') and hasattr(item, 'position'):
-                container_id = item.containerId
-                if container_id in self.container_states and item.position:
-                    container_state = self.container_states[container_id]
-                    pos = item.position
-                    if pos and 'startCoordinates' in pos and 'endCoordinates' in pos:
-                        start = pos['startCoordinates']
-                        end = pos['endCoordinates']
-                        
-                        # Only add if not already in the container
-                        if not any(pi.item_id == item_id for pi in container_state.placed_items):
-                            width = end['width'] - start['width']
-                            depth = end['depth'] - start['depth']
-                            height = end['height'] - start['height']
-                            
-                            container_state.place_item(
-                                item_id, start['width'], start['depth'], start['height'],
-                                width, depth, height, (item.width, item.depth, item.height), 
-                                item.priority
-                            )
+            container_state = self.container_states.get(item.containerId)
+            pos = item.position
+            if container_state is None or not pos:
+                continue
+            
+            # Only add if not already in the container
+            if item_id in container_state._placed_ids:
+                continue
+            
+            start = pos.get('startCoordinates')
+            end = pos.get('endCoordinates')
+            if start is None or end is None:
+                continue
+            
+            start_x, start_y, start_z = start['width'], start['depth'], start['height']
+            container_state.place_item(
+                item_id, start_x, start_y, start_z,
+                end['width'] - start_x, end['depth'] - start_y, end['height'] - start_z,
+                (item.width, item.depth, item.height), item.priority, item.expiryDate
+            )
+    
+    def _sync_rank_cache(self):
+        """Drop cached rankings once any container's contents have changed"""
+        token = tuple(cs._version for cs in self.container_states.values())
+        if token != self._rank_cache_token:
+            self._rank_cache.clear()
+            self._rank_cache_token = token
     
     def _rank_containers_for_item(self, item: Item) -> List[Tuple[float, str]]:
         """Rank containers by suitability for this item"""
+        # Identical items against unchanged containers rank identically
+        self._sync_rank_cache()
+        cache_key = ("basic", item.width, item.depth, item.height, item.priority, item.preferredZone)
+        cached = self._rank_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         rankings = []
+        item_width, item_depth, item_height = item.width, item.depth, item.height
+        item_volume = item_width * item_depth * item_height
         
-        for container_id, container_state in self.container_states.items():
+        for container_id, container_state, c_width, c_height, c_zone in self._container_rows:
             # Check if item can possibly fit in this container
-            if (item.width > container_state.width and item.depth > container_state.width) or \
-               (item.height > container_state.height):
+            if (item_width > c_width and item_depth > c_width) or item_height > c_height:
                 continue
             
             # Calculate base score from various factors
             
             # Zone match (0-100)
-            zone_score = self.calculate_zone_match_score(
-                item.preferredZone, container_state.zone
-            ) * 100
+            zone_score = self.calculate_zone_match_score(item.preferredZone, c_zone) * 100
             
             # Space efficiency (0-20)
-            volume_ratio = min(1.0, (item.width * item.depth * item.height) / 
-                              (container_state.width * container_state.depth * container_state.height))
+            volume_ratio = min(1.0, item_volume / container_state.total_volume)
             efficiency_score = (1 - volume_ratio) * 20  # Prefer containers that aren't too small
             
             # Utilization (0-20)
@@ -1072,10 +1275,9 @@ class AdvancedPlacementEngine:
             largest_space = container_state.get_largest_free_space()
             can_fit = False
             if largest_space:
-                orientations = largest_space.can_fit_any_orientation(
+                can_fit = largest_space.fits_any_orientation(
                     item.width, item.depth, item.height
                 )
-                can_fit = len(orientations) > 0
             
             free_space_score = 60 if can_fit else 0
             
@@ -1085,27 +1287,39 @@ class AdvancedPlacementEngine:
         
         # Sort by score (highest first)
         rankings.sort(reverse=True)
+        self._rank_cache[cache_key] = rankings
         return rankings
     
     def _rank_containers_for_item_enhanced(self, item: Item) -> List[Tuple[float, str]]:
         """Enhanced container ranking using new priority calculation and zone optimization"""
+        # Expiry feeds the composite priority, so it is part of the key here
+        self._sync_rank_cache()
+        cache_key = ("enhanced", item.width, item.depth, item.height, item.priority,
+                     item.preferredZone, item.expiryDate)
+        cached = self._rank_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         rankings = []
+        item_width, item_depth, item_height = item.width, item.depth, item.height
+        item_volume = item_width * item_depth * item_height
         placement_strategy = ZoneOptimizer.get_zone_placement_strategy(item)
         force_preferred = PriorityCalculator.should_force_preferred_zone(item)
+        preferred_zone = item.preferredZone.lower()
         
-        for container_id, container_state in self.container_states.items():
+        for container_id, container_state, c_width, c_height, c_zone in self._container_rows:
             # Check if item can possibly fit in this container
-            if (item.width > container_state.width and item.depth > container_state.width) or \
-               (item.height > container_state.height):
+            if (item_width > c_width and item_depth > c_width) or item_height > c_height:
                 continue
             
-            # Enhanced zone and priority scoring
-            zone_priority_score = ZoneOptimizer.calculate_zone_priority_score(item, container_state.zone)
-            
             # For items that must be in preferred zone, skip non-matching containers
-            if force_preferred and item.preferredZone.lower() != container_state.zone.lower():
+            # (before any scoring work is spent on them)
+            if force_preferred and preferred_zone != container_state.zone_lc:
                 continue
             
+            # Enhanced zone and priority scoring
+            zone_priority_score = ZoneOptimizer.calculate_zone_priority_score(item, c_zone)
+            
             # Calculate accessibility potential (prefer less crowded containers for high priority)
             utilization = container_state.get_utilization()
             accessibility_score = 0
@@ -1121,7 +1335,7 @@ class AdvancedPlacementEngine:
                     space_score = 60
                     # Bonus for exact fit
                     best_orientation = min(orientations, key=lambda o: o[0] * o[1] * o[2])
-                    fit_efficiency = (item.width * item.depth * item.height) / (best_orientation[0] * best_orientation[1] * best_orientation[2])
+                    fit_efficiency = item_volume / (best_orientation[0] * best_orientation[1] * best_orientation[2])
                     space_score += fit_efficiency * 20
             
             # Combined score with strategy weighting
@@ -1136,21 +1350,21 @@ class AdvancedPlacementEngine:
         
         # Sort by score (highest first)
         rankings.sort(reverse=True)
+        self._rank_cache[cache_key] = rankings
         return rankings
     
-    def _place_high_priority_item(self, item: Item, containers: Dict[str, Container]) -> Optional[Dict]:
+    def _place_high_priority_item(self, item: Item, containers: Dict[str, Container],
+                                  force_preferred: Optional[bool] = None) -> Optional[Dict]:
         """Specialized placement for high priority items (priority >= 80)"""
-        logger.info(f"Placing high priority item {item.itemId} (priority: {item.priority})")
+        logger.info("Placing high priority item %s (priority: %s)", item.itemId, item.priority)
         
         # Force preferred zone for high priority items (>= 85) or special conditions
-        force_preferred = PriorityCalculator.should_force_preferred_zone(item)
+        if force_preferred is None:
+            force_preferred = PriorityCalculator.should_force_preferred_zone(item)
         
         if force_preferred:
             # Force preferred zone containers first
-            preferred_containers = []
-            for container_id, container_state in self.container_states.items():
-                if item.preferredZone.lower() == container_state.zone.lower():
-                    preferred_containers.append((container_id, container_state))
+            preferred_containers = self._containers_by_zone.get(item.preferredZone.lower(), ())
             
             # Try preferred zone containers first
             for container_id, container_state in preferred_containers:
@@ -1160,7 +1374,7 @@ class AdvancedPlacementEngine:
                     x, y, z, width, depth, height = position
                     success = container_state.place_item(
                         item.itemId, x, y, z, width, depth, height,
-                        (item.width, item.depth, item.height), item.priority
+                        (item.width, item.depth, item.height), item.priority, item.expiryDate
                     )
                     
                     if success:
@@ -1187,12 +1401,12 @@ class AdvancedPlacementEngine:
                 x, y, z, width, depth, height = position
                 success = container_state.place_item(
                     item.itemId, x, y, z, width, depth, height,
-                    (item.width, item.depth, item.height), item.priority
+                    (item.width, item.depth, item.height), item.priority, item.expiryDate
                 )
                 
                 if success:
                     if force_preferred:
-                        logger.warning(f"Preferred zone full for high priority item {item.itemId}, using fallback")
+                        logger.warning("Preferred zone full for high priority item %s, using fallback", item.itemId)
                     return {
                         "itemId": item.itemId,
                         "containerId": container_id,
@@ -1204,8 +1418,11 @@ class AdvancedPlacementEngine:
         
         return None
     
-    def _place_medium_priority_item(self, item: Item, containers: Dict[str, Container]) -> Optional[Dict]:
+    def _place_medium_priority_item(self, item: Item, containers: Dict[str, Container],
+                                    force_preferred: Optional[bool] = None) -> Optional[Dict]:
         """Specialized placement for medium priority items (priority 50-79)"""
+        # force_preferred is accepted for a uniform strategy signature; the
+        # medium priority ranking already handles forced zones itself
         # Use enhanced container ranking
         rankings = self._rank_containers_for_item_enhanced(item)
         
@@ -1218,7 +1435,7 @@ class AdvancedPlacementEngine:
                 x, y, z, width, depth, height = position
                 success = container_state.place_item(
                     item.itemId, x, y, z, width, depth, height,
-                    (item.width, item.depth, item.height), item.priority
+                    (item.width, item.depth, item.height), item.priority, item.expiryDate
                 )
                 
                 if success:
@@ -1233,8 +1450,10 @@ class AdvancedPlacementEngine:
         
         return None
     
-    def _place_low_priority_item(self, item: Item, containers: Dict[str, Container]) -> Optional[Dict]:
+    def _place_low_priority_item(self, item: Item, containers: Dict[str, Container],
+                                 force_preferred: Optional[bool] = None) -> Optional[Dict]:
         """Specialized placement for low priority items (priority < 50)"""
+        # force_preferred is accepted for a uniform strategy signature only
         # For low priority items, prioritize space efficiency over zone preference
         best_position = None
         best_efficiency = 0
@@ -1263,7 +1482,7 @@ class AdvancedPlacementEngine:
             container_state = self.container_states[best_container_id]
             success = container_state.place_item(
                 item.itemId, x, y, z, width, depth, height,
-                (item.width, item.depth, item.height), item.priority
+                (item.width, item.depth, item.height), item.priority, item.expiryDate
             )
             
             if success:
@@ -1289,15 +1508,24 @@ class AdvancedPlacementEngine:
             (item.depth, item.width, item.height)  # Only 0° and 90° for evaluation compatibility
         ]
         
+        # Spaces come front-most first, so the first fit per orientation is that
+        # orientation's best and the scan stops once it can no longer improve
+        front_first = container_state.get_free_spaces_front_first()
+        
         for width, depth, height in orientations:
-            for free_space in container_state.free_spaces:
+            for free_space in front_first:
+                # Prefer positions closer to the front (lower y values)
+                if free_space.y >= min_depth:
+                    break
+                
                 if free_space.can_fit(width, depth, height):
-                    # Prefer positions closer to the front (lower y values)
-                    y_position = free_space.y
-                    
-                    if y_position < min_depth:
-                        min_depth = y_position
-                        best_position = (free_space.x, free_space.y, free_space.z, width, depth, height)
+                    min_depth = free_space.y
+                    best_position = (free_space.x, free_space.y, free_space.z, width, depth, height)
+                    break
+            
+            # Nothing can be closer than the open face itself
+            if min_depth <= 0:
+                break
         
         return best_position
     
@@ -1314,7 +1542,7 @@ class AdvancedPlacementEngine:
                 x, y, z, width, depth, height = position
                 success = container_state.place_item(
                     item.itemId, x, y, z, width, depth, height,
-                    (item.width, item.depth, item.height), item.priority
+                    (item.width, item.depth, item.height), item.priority, item.expiryDate
                 )
                 
                 if success:
@@ -1331,38 +1559,56 @@ class AdvancedPlacementEngine:
     
     def _try_place_item_optimized(self, item: Item, container_state: 'ContainerState') -> Optional[Tuple[float, float, float, float, float, float]]:
         """Optimized item placement with better orientation handling"""
-        # Try multiple orientations (0°, 90°, and if item allows, 180° and 270°)
-        orientations = [
-            (item.width, item.depth, item.height),
-            (item.depth, item.width, item.height)
-        ]
+        item_width, item_depth, item_height = item.width, item.depth, item.height
+        orientations = _placement_orientations(item_width, item_depth, item_height)
         
-        # Add vertical orientations if the item can be rotated
-        if item.height < max(item.width, item.depth):
-            orientations.extend([
-                (item.height, item.depth, item.width),
-                (item.height, item.width, item.depth),
-                (item.width, item.height, item.depth),
-                (item.depth, item.height, item.width)
-            ])
+        # Volume does not change with orientation
+        item_volume = item_width * item_depth * item_height
+        priority = item.priority
+        free_spaces = container_state.free_spaces
+        calculate_position_score = container_state._calculate_position_score
         
         best_position = None
         best_score = -1
-        
-        for width, depth, height in orientations:
-            for free_space in container_state.free_spaces:
-                if free_space.can_fit(width, depth, height):
-                    # Score this position - prefer positions that minimize waste
-                    space_efficiency = (width * depth * height) / free_space.volume
-                    accessibility_score = max(0, 100 - free_space.y)  # Prefer front positions
-                    
-                    score = container_state._calculate_position_score(
-                        free_space.x, free_space.y, free_space.z, item.priority
-                    ) + space_efficiency * 20 + accessibility_score * 0.1
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_position = (free_space.x, free_space.y, free_space.z, width, depth, height)
+        best_orientation_index = 0
+        
+        # The score only depends on the free space, so each space is scored once
+        # and paired with the first orientation that fits it. Ties go to the
+        # lowest orientation index, then the earliest space, which is the order
+        # an orientation-by-space scan would have reached them in.
+        for free_space in free_spaces:
+            fw, fd, fh = free_space.width, free_space.depth, free_space.height
+            
+            for orientation_index, (width, depth, height) in enumerate(orientations):
+                if width <= fw and depth <= fd and height <= fh:
+                    break
+            else:
+                continue
+            
+            fx, fy, fz = free_space.x, free_space.y, free_space.z
+            
+            # Score this position - prefer positions that minimize waste
+            space_efficiency = item_volume / free_space.volume
+            accessibility_score = max(0, 100 - fy)  # Prefer front positions
+            
+            # Upper bound: the position score with full compactness credit. Only
+            # the compactness term needs a scan over the placed items, so skip
+            # spaces that could not reach the best score even with it (equal
+            # bounds are still scored to keep the tie-breaking unchanged)
+            upper_bound = (
+                accessibility_score * 0.4 + max(0, 100 - fz) * 0.3 + 100 * 0.1 + priority * 0.2
+            ) + space_efficiency * 20 + accessibility_score * 0.1
+            if upper_bound < best_score:
+                continue
+            
+            score = calculate_position_score(
+                fx, fy, fz, priority
+            ) + space_efficiency * 20 + accessibility_score * 0.1
+            
+            if score > best_score or (score == best_score and orientation_index < best_orientation_index):
+                best_score = score
+                best_orientation_index = orientation_index
+                best_position = (fx, fy, fz, width, depth, height)
         
         return best_position
     
@@ -1371,7 +1617,7 @@ class AdvancedPlacementEngine:
         Enhanced placement method using comprehensive priority handling.
         Handles multiple priority variables: priority, expiry, usage, preferred zones.
         """
-        logger.info(f"Starting enhanced priority placement for {len(items)} items")
+        logger.info("Starting enhanced priority placement for %d items", len(items))
         
         # Initialize container states
         self._initialize_container_states(containers, {})
@@ -1382,58 +1628,63 @@ class AdvancedPlacementEngine:
         placements = []
         
         # Initialize tracking for placement metrics
-        high_priority_count = 0
-        medium_priority_count = 0
-        low_priority_count = 0
         preferred_zone_placements = 0
-        forced_zone_placements = 0
         
         # Initialize accessibility tracker for optimizing retrieval
         self.accessibility_tracker = AccessibilityTracker()
         
+        # Forced-zone decisions only depend on the item, so resolve them once
+        # up front instead of again inside the high priority placement path
+        force_flags = [PriorityCalculator.should_force_preferred_zone(item) for item in sorted_items]
+        
+        # Priority band per item, from base priority: 0 = high (>= 80),
+        # 1 = medium (50-79), 2 = low (< 50). Indexes the strategy table below.
+        bands = [0 if item.priority >= 80 else 1 if item.priority >= 50 else 2 for item in sorted_items]
+        place_by_band = (
+            self._place_high_priority_item,
+            self._place_medium_priority_item,
+            self._place_low_priority_item
+        )
+        
+        log_progress = logger.isEnabledFor(logging.INFO)
+        
         # Process items using priority-specific strategies
         for i, item in enumerate(sorted_items):
-            if i % 50 == 0:  # Progress logging
-                logger.info(f"Processing item {i+1}/{len(sorted_items)}: {item.itemId}")
+            if i % 50 == 0 and log_progress:  # Progress logging
+                logger.info("Processing item %d/%d: %s", i + 1, len(sorted_items), item.itemId)
             
-            # Calculate composite priority and determine strategy
-            composite_priority = PriorityCalculator.calculate_composite_priority(item)
-            force_preferred = PriorityCalculator.should_force_preferred_zone(item)
-            placement_strategy = ZoneOptimizer.get_zone_placement_strategy(item)
-            
-            placement = None
+            band = bands[i]
+            force_preferred = force_flags[i]
             
             # Use priority-specific placement strategies
-            if item.priority >= 80:  # Use base priority for high priority classification
-                placement = self._place_high_priority_item(item, containers)
-                high_priority_count += 1
-                if force_preferred:
-                    forced_zone_placements += 1
-            elif item.priority >= 50:  # Use base priority for medium priority classification
-                placement = self._place_medium_priority_item(item, containers)
-                medium_priority_count += 1
-            else:
-                placement = self._place_low_priority_item(item, containers)
-                low_priority_count += 1
+            placement = place_by_band[band](item, containers, force_preferred)
             
             if placement:
                 placements.append(placement)
                 
                 # Track preferred zone placement success
                 container_id = placement["containerId"]
-                container_zone = self.container_states[container_id].zone
-                if item.preferredZone and item.preferredZone.lower() == container_zone.lower():
+                container_zone_lc = self.container_states[container_id].zone_lc
+                if item.preferredZone and item.preferredZone.lower() == container_zone_lc:
                     preferred_zone_placements += 1
         
-        # Log comprehensive placement statistics
+        # Log comprehensive placement statistics (skipped entirely when INFO is off)
+        if not logger.isEnabledFor(logging.INFO):
+            return placements
+        
+        # Band and forced-zone counts follow from the precomputed per-item columns
+        band_counts = [bands.count(band) for band in range(3)]
+        forced_zone_placements = sum(1 for band, forced in zip(bands, force_flags) if band == 0 and forced)
+        
         total_placed = len(placements)
-        logger.info(f"Enhanced priority placement complete:")
-        logger.info(f"  Total placed: {total_placed}/{len(items)} ({100*total_placed/len(items):.1f}%)")
-        logger.info(f"  High priority: {high_priority_count}")
-        logger.info(f"  Medium priority: {medium_priority_count}")
-        logger.info(f"  Low priority: {low_priority_count}")
-        logger.info(f"  Preferred zone success: {preferred_zone_placements}/{total_placed} ({100*preferred_zone_placements/max(1,total_placed):.1f}%)")
-        logger.info(f"  Forced zone placements: {forced_zone_placements}")
+        logger.info("Enhanced priority placement complete:")
+        logger.info("  Total placed: %d/%d (%.1f%%)", total_placed, len(items), 100 * total_placed / max(1, len(items)))
+        logger.info("  High priority: %d", band_counts[0])
+        logger.info("  Medium priority: %d", band_counts[1])
+        logger.info("  Low priority: %d", band_counts[2])
+        logger.info("  Preferred zone success: %d/%d (%.1f%%)", preferred_zone_placements, total_placed,
+                    100 * preferred_zone_placements / max(1, total_placed))
+        logger.info("  Forced zone placements: %d", forced_zone_placements)
         
         # Calculate and log space utilization
         total_utilization = 0
@@ -1444,11 +1695,11 @@ class AdvancedPlacementEngine:
                 container_count += 1
         
         avg_utilization = total_utilization / max(1, container_count)
-        logger.info(f"  Average space utilization: {avg_utilization:.1f}%")
+        logger.info("  Average space utilization: %.1f%%", avg_utilization)
         
         return placements
     
-    def get_retrieval_recommendations(self, items: List[Item]) -> List[Dict]:
+    def get_retrieval_recommendations(self, items: List[Item], top_k: Optional[int] = None) -> List[Dict]:
         """
         Get retrieval recommendations based on composite priority and accessibility.
         Returns items sorted by retrieval priority considering:
@@ -1456,37 +1707,44 @@ class AdvancedPlacementEngine:
         - Expiry urgency
         - Usage depletion
         - Retrieval difficulty (accessibility)
+        
+        If top_k is given, only the top_k highest priority recommendations are returned.
         """
         retrieval_recommendations = []
+        # One reference time for the whole batch
+        current_time = datetime.now()
         
         for item in items:
             # Find the container and calculate retrieval steps
-            container_id = getattr(item, 'containerId', None)
+            container_id = item.containerId
             if container_id and container_id in self.container_states:
                 container_state = self.container_states[container_id]
                 retrieval_steps = self.accessibility_tracker.calculate_retrieval_steps(
                     item.itemId, container_state
                 )
                 
-                # Calculate retrieval priority
-                retrieval_priority = PriorityCalculator.calculate_retrieval_priority(
-                    item, retrieval_steps
+                # Calculate retrieval priority from a single composite priority evaluation
+                composite_priority = PriorityCalculator.calculate_composite_priority(item, current_time)
+                retrieval_priority = PriorityCalculator.retrieval_priority_from_composite(
+                    item, composite_priority, retrieval_steps
                 )
                 
                 retrieval_recommendations.append({
                     "itemId": item.itemId,
-                    "name": getattr(item, 'name', item.itemId),
+                    "name": item.name,
                     "retrievalPriority": retrieval_priority,
                     "retrievalSteps": retrieval_steps,
-                    "compositePriority": PriorityCalculator.calculate_composite_priority(item),
+                    "compositePriority": composite_priority,
                     "basePriority": item.priority,
                     "containerId": container_id,
-                    "accessibilityScore": self.accessibility_tracker.get_accessibility_score(
-                        item.itemId, container_state
-                    )
+                    "accessibilityScore": AccessibilityTracker.accessibility_score_from_steps(retrieval_steps)
                 })
         
-        # Sort by retrieval priority (highest first)
+        # Sort by retrieval priority (highest first); a partial heap selection
+        # is enough when only the top entries are wanted
+        if top_k is not None:
+            return heapq.nlargest(top_k, retrieval_recommendations, key=lambda x: x["retrievalPriority"])
+        
         retrieval_recommendations.sort(key=lambda x: x["retrievalPriority"], reverse=True)
         
         return retrieval_recommendations
@@ -1508,26 +1766,20 @@ class AdvancedPlacementEngine:
             preferred_zone = critical_item.preferredZone.lower()
             
             # Find containers in preferred zone
-            preferred_containers = [
-                (cid, cstate) for cid, cstate in self.container_states.items()
-                if cstate.zone.lower() == preferred_zone
-            ]
+            preferred_containers = self._containers_by_zone.get(preferred_zone, ())
             
             for container_id, container_state in preferred_containers:
                 # Check if there's space for the critical item
                 largest_space = container_state.get_largest_free_space()
-                if not largest_space or not largest_space.can_fit_any_orientation(
+                if not largest_space or not largest_space.fits_any_orientation(
                     critical_item.width, critical_item.depth, critical_item.height
                 ):
-                    # Find low-priority items that could be moved
-                    moveable_items = [
-                        item for item in container_state.placed_items
-                        if item.priority < 50  # Low priority items
-                    ]
+                    # Low-priority items that could be moved are kept in a max-heap by volume
+                    low_priority_heap = container_state._low_priority_heap
                     
-                    if moveable_items:
+                    if low_priority_heap:
                         # Suggest moving the largest low-priority item
-                        largest_moveable = max(moveable_items, key=lambda x: x.get_volume())
+                        largest_moveable = container_state.placed_items[low_priority_heap[0][1]]
                         
                         rearrangement_suggestions.append({
                             "action": "move_to_make_space",
@@ -1540,30 +1792,31 @@ class AdvancedPlacementEngine:
         
         return rearrangement_suggestions
     
-    def optimize_for_expiry_urgency(self) -> List[Dict]:
+    def optimize_for_expiry_urgency(self, top_k: Optional[int] = None) -> List[Dict]:
         """
         Optimize placement for items approaching expiry.
         Returns suggestions to move soon-to-expire items to more accessible locations.
+        If top_k is given, only the top_k most urgent suggestions are returned.
         """
         urgency_optimizations = []
         current_time = datetime.now()
+        # (expiry - now).days <= 30 exactly when expiry < now + 31 days
+        cutoff = (current_time + timedelta(days=31),)
         
         for container_id, container_state in self.container_states.items():
-            for placed_item in container_state.placed_items:
-                # Calculate days to expiry if expiry date exists
-                days_to_expiry = None
-                if hasattr(placed_item, 'expiryDate') and placed_item.expiryDate:
-                    try:
-                        if isinstance(placed_item.expiryDate, str):
-                            expiry_date = datetime.fromisoformat(placed_item.expiryDate.replace('Z', '+00:00'))
-                        else:
-                            expiry_date = placed_item.expiryDate
-                        days_to_expiry = (expiry_date - current_time).days
-                    except (ValueError, TypeError):
-                        continue
+            # Only the expiry index prefix before the cutoff can qualify; visit
+            # those items in placement order
+            expiry_index = container_state._expiry_index
+            expiring_soon = sorted(
+                expiry_index[:bisect.bisect_left(expiry_index, cutoff)], key=lambda entry: entry[1]
+            )
+            
+            for expiry_date, index in expiring_soon:
+                placed_item = container_state.placed_items[index]
+                days_to_expiry = (expiry_date - current_time).days
                 
                 # Check if item is approaching expiry and not easily accessible
-                if days_to_expiry is not None and days_to_expiry <= 30:  # Expires within 30 days
+                if days_to_expiry <= 30:  # Expires within 30 days
                     retrieval_steps = self.accessibility_tracker.calculate_retrieval_steps(
                         placed_item.item_id, container_state
                     )
@@ -1579,6 +1832,9 @@ class AdvancedPlacementEngine:
                         })
         
         # Sort by urgency (least days to expiry first)
+        if top_k is not None:
+            return heapq.nsmallest(top_k, urgency_optimizations, key=lambda x: x["daysToExpiry"])
+        
         urgency_optimizations.sort(key=lambda x: x["daysToExpiry"])
         
         return urgency_optimizations
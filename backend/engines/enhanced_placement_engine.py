@@ -11,12 +11,65 @@ from typing import List, Dict, Optional, Tuple, Set
 import math
 import time
 import heapq
+from functools import lru_cache
 from datetime import datetime
 from backend.models.item import Item
 from backend.models.container import Container
 
+def _any_overlap(aabbs: List[Tuple[float, float, float, float, float, float]],
+                 x1: float, y1: float, z1: float, x2: float, y2: float, z2: float) -> bool:
+    """True if the box (x1, y1, z1)-(x2, y2, z2) overlaps any of the given AABBs"""
+    for ex1, ey1, ez1, ex2, ey2, ez2 in aabbs:
+        # Check for overlap on all three axes
+        if not (x2 <= ex1 or x1 >= ex2 or
+                y2 <= ey1 or y1 >= ey2 or
+                z2 <= ez1 or z1 >= ez2):
+            return True
+    return False
+
+def _box_is_free(aabbs: List[Tuple[float, float, float, float, float, float]],
+                 width: float, depth: float, height: float,
+                 x1: float, y1: float, z1: float, x2: float, y2: float, z2: float) -> bool:
+    """
+    True if the box (x1, y1, z1)-(x2, y2, z2) lies inside a width x depth x height
+    container and overlaps none of the given AABBs (boundary and collision in one call)
+    """
+    if (x1 < 0 or y1 < 0 or z1 < 0 or
+        x2 > width or y2 > depth or z2 > height):
+        return False
+    for ex1, ey1, ez1, ex2, ey2, ez2 in aabbs:
+        if not (x2 <= ex1 or x1 >= ex2 or
+                y2 <= ey1 or y1 >= ey2 or
+                z2 <= ez1 or z1 >= ez2):
+            return False
+    return True
+
+@lru_cache(maxsize=4096)
+def _parse_expiry(expiry_date: str) -> Optional[datetime]:
+    """Memoized ISO expiry parsing (None for unparseable values)"""
+    try:
+        return datetime.fromisoformat(expiry_date.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=4096)
+def _grid_axis(extent: float, item_size: float, step: int) -> Tuple[int, ...]:
+    """
+    Memoized grid coordinates 0, step, 2*step, ... at which an item of
+    item_size still fits inside extent along one axis
+    """
+    return tuple(c for c in range(0, int(extent - item_size) + 1, step)
+                 if c + item_size <= extent)
+
+@lru_cache(maxsize=1024)
+def _normalize_zone(zone: str) -> str:
+    """Memoized zone name normalization for partial matching ('Storage_Bay' -> 'storagebay')"""
+    return zone.lower().replace('_', '').replace(' ', '')
+
 class FreeSpace:
     """Represents a block of free space in 3D"""
+    __slots__ = ('x', 'y', 'z', 'width', 'depth', 'height', 'x2', 'y2', 'z2')
+    
     def __init__(self, x: float, y: float, z: float, width: float, depth: float, height: float):
         self.x = x
         self.y = y
@@ -24,6 +77,11 @@ class FreeSpace:
         self.width = width
         self.depth = depth
         self.height = height
+        # Free spaces are never resized in place (splits build new ones), so the
+        # far faces are computed once here
+        self.x2 = x + width
+        self.y2 = y + depth
+        self.z2 = z + height
         
     @property
     def volume(self) -> float:
@@ -37,6 +95,8 @@ class FreeSpace:
 
 class PlacedItem:
     """Represents an item that has been placed in 3D space"""
+    __slots__ = ('x', 'y', 'z', 'width', 'depth', 'height', 'item_id', '_aabb')
+    
     def __init__(self, x: float, y: float, z: float, width: float, depth: float, height: float, item_id: str):
         self.x = x
         self.y = y
@@ -45,11 +105,12 @@ class PlacedItem:
         self.depth = depth
         self.height = height
         self.item_id = item_id
+        # Bounds are fixed once placed, so build the AABB tuple a single time
+        self._aabb = (x, y, z, x + width, y + depth, z + height)
         
     def get_aabb(self) -> Tuple[float, float, float, float, float, float]:
         """Get axis-aligned bounding box coordinates (x1, y1, z1, x2, y2, z2)"""
-        return (self.x, self.y, self.z, 
-                self.x + self.width, self.y + self.depth, self.z + self.height)
+        return self._aabb
 
 class ContainerSpace:
     """Advanced 3D space management for a single container"""
@@ -58,40 +119,24 @@ class ContainerSpace:
         self.depth = depth
         self.height = height
         self.placed_items: List[PlacedItem] = []
+        # AABBs of placed_items (x1, y1, z1, x2, y2, z2), index-aligned, for collision scans
+        self._placed_aabbs: List[Tuple[float, float, float, float, float, float]] = []
         self.free_spaces: List[FreeSpace] = [FreeSpace(0, 0, 0, width, depth, height)]
         
     def can_place_item(self, x: float, y: float, z: float, width: float, depth: float, height: float) -> bool:
         """Check if an item can be placed at the specified position using AABB collision detection"""
-        # Boundary check
-        if (x < 0 or y < 0 or z < 0 or 
-            x + width > self.width or 
-            y + depth > self.depth or 
-            z + height > self.height):
-            return False
-        
-        # AABB collision detection
-        new_x1, new_y1, new_z1 = x, y, z
-        new_x2, new_y2, new_z2 = x + width, y + depth, z + height
-        
-        for placed_item in self.placed_items:
-            placed_x1, placed_y1, placed_z1, placed_x2, placed_y2, placed_z2 = placed_item.get_aabb()
-            
-            # Check for overlap on all three axes
-            if not (new_x2 <= placed_x1 or new_x1 >= placed_x2 or
-                    new_y2 <= placed_y1 or new_y1 >= placed_y2 or
-                    new_z2 <= placed_z1 or new_z1 >= placed_z2):
-                return False
-        
-        return True
+        return _box_is_free(self._placed_aabbs, self.width, self.depth, self.height,
+                            x, y, z, x + width, y + depth, z + height)
         
     def place_item(self, x: float, y: float, z: float, width: float, depth: float, height: float, item_id: str) -> bool:
         """Place an item and update space management"""
-        if not self.can_place_item(x, y, z, width, depth, height):
+        placed_item = PlacedItem(x, y, z, width, depth, height, item_id)
+        if not _box_is_free(self._placed_aabbs, self.width, self.depth, self.height, *placed_item.get_aabb()):
             return False
             
         # Add to placed items
-        placed_item = PlacedItem(x, y, z, width, depth, height, item_id)
         self.placed_items.append(placed_item)
+        self._placed_aabbs.append(placed_item.get_aabb())
         
         # Update free spaces by removing occupied area
         self._update_free_spaces(x, y, z, width, depth, height)
@@ -99,145 +144,142 @@ class ContainerSpace:
         
     def _update_free_spaces(self, x: float, y: float, z: float, width: float, depth: float, height: float):
         """Update free spaces after placing an item"""
-        item_space = FreeSpace(x, y, z, width, depth, height)
         new_free_spaces = []
         
+        # Overlap test against the cached far faces of each space (x2/y2/z2);
+        # most disjoint spaces are told apart by the first comparison
+        x2, y2, z2 = x + width, y + depth, z + height
+        
         for free_space in self.free_spaces:
-            if self._spaces_overlap(free_space, item_space):
+            if not (free_space.x2 <= x or x2 <= free_space.x or
+                    free_space.y2 <= y or y2 <= free_space.y or
+                    free_space.z2 <= z or z2 <= free_space.z):
                 # Split the free space around the item
-                split_spaces = self._split_free_space(free_space, item_space)
-                new_free_spaces.extend(split_spaces)
-            else:
+                self._split_free_space(free_space, x, y, z, x2, y2, z2, new_free_spaces)
+            elif free_space.width > 0.1 and free_space.depth > 0.1 and free_space.height > 0.1:
                 new_free_spaces.append(free_space)
         
-        # Filter out tiny spaces
-        self.free_spaces = [fs for fs in new_free_spaces 
-                           if fs.width > 0.1 and fs.depth > 0.1 and fs.height > 0.1]
+        self.free_spaces = new_free_spaces
     
-    def _spaces_overlap(self, space1: FreeSpace, space2: FreeSpace) -> bool:
-        """Check if two 3D spaces overlap"""
-        return not (space1.x + space1.width <= space2.x or 
-                   space2.x + space2.width <= space1.x or
-                   space1.y + space1.depth <= space2.y or 
-                   space2.y + space2.depth <= space1.y or
-                   space1.z + space1.height <= space2.z or 
-                   space2.z + space2.height <= space1.z)
-    
-    def _split_free_space(self, free_space: FreeSpace, item_space: FreeSpace) -> List[FreeSpace]:
-        """Split a free space around an item space"""
-        split_spaces = []
+    def _split_free_space(self, free_space: FreeSpace,
+                          x1: float, y1: float, z1: float, x2: float, y2: float, z2: float,
+                          out: List[FreeSpace]):
+        """
+        Split a free space around the item box (x1, y1, z1)-(x2, y2, z2), appending
+        the pieces to out. Pieces too thin to hold anything (<= 0.1 on any axis)
+        are dropped before a FreeSpace is allocated for them.
+        """
+        fx, fy, fz = free_space.x, free_space.y, free_space.z
+        fd, fh = free_space.depth, free_space.height
+        fx2, fy2, fz2 = free_space.x2, free_space.y2, free_space.z2
         
         # Create up to 6 new free spaces around the placed item
         # Left
-        if item_space.x > free_space.x:
-            split_spaces.append(FreeSpace(
-                free_space.x, free_space.y, free_space.z,
-                item_space.x - free_space.x, free_space.depth, free_space.height
-            ))
+        if x1 > fx:
+            w = x1 - fx
+            if w > 0.1 and fd > 0.1 and fh > 0.1:
+                out.append(FreeSpace(fx, fy, fz, w, fd, fh))
         
         # Right
-        if free_space.x + free_space.width > item_space.x + item_space.width:
-            split_spaces.append(FreeSpace(
-                item_space.x + item_space.width, free_space.y, free_space.z,
-                (free_space.x + free_space.width) - (item_space.x + item_space.width),
-                free_space.depth, free_space.height
-            ))
+        if fx2 > x2:
+            w = fx2 - x2
+            if w > 0.1 and fd > 0.1 and fh > 0.1:
+                out.append(FreeSpace(x2, fy, fz, w, fd, fh))
+        
+        # The remaining pieces are clipped to the x (and then y) overlap
+        x_start = max(fx, x1)
+        x_end = min(fx2, x2)
+        if not x_end > x_start:
+            return
+        w = x_end - x_start
+        if not w > 0.1:
+            return
         
         # Front (within x bounds)
-        if item_space.y > free_space.y:
-            x_start = max(free_space.x, item_space.x)
-            x_end = min(free_space.x + free_space.width, item_space.x + item_space.width)
-            if x_end > x_start:
-                split_spaces.append(FreeSpace(
-                    x_start, free_space.y, free_space.z,
-                    x_end - x_start, item_space.y - free_space.y, free_space.height
-                ))
+        if y1 > fy:
+            d = y1 - fy
+            if d > 0.1 and fh > 0.1:
+                out.append(FreeSpace(x_start, fy, fz, w, d, fh))
         
         # Back (within x bounds)
-        if free_space.y + free_space.depth > item_space.y + item_space.depth:
-            x_start = max(free_space.x, item_space.x)
-            x_end = min(free_space.x + free_space.width, item_space.x + item_space.width)
-            if x_end > x_start:
-                split_spaces.append(FreeSpace(
-                    x_start, item_space.y + item_space.depth, free_space.z,
-                    x_end - x_start,
-                    (free_space.y + free_space.depth) - (item_space.y + item_space.depth),
-                    free_space.height
-                ))
+        if fy2 > y2:
+            d = fy2 - y2
+            if d > 0.1 and fh > 0.1:
+                out.append(FreeSpace(x_start, y2, fz, w, d, fh))
+        
+        y_start = max(fy, y1)
+        y_end = min(fy2, y2)
+        if not y_end > y_start:
+            return
+        d = y_end - y_start
+        if not d > 0.1:
+            return
         
         # Bottom (within x,y bounds)
-        if item_space.z > free_space.z:
-            x_start = max(free_space.x, item_space.x)
-            x_end = min(free_space.x + free_space.width, item_space.x + item_space.width)
-            y_start = max(free_space.y, item_space.y)
-            y_end = min(free_space.y + free_space.depth, item_space.y + item_space.depth)
-            if x_end > x_start and y_end > y_start:
-                split_spaces.append(FreeSpace(
-                    x_start, y_start, free_space.z,
-                    x_end - x_start, y_end - y_start, item_space.z - free_space.z
-                ))
+        if z1 > fz:
+            h = z1 - fz
+            if h > 0.1:
+                out.append(FreeSpace(x_start, y_start, fz, w, d, h))
         
         # Top (within x,y bounds)
-        if free_space.z + free_space.height > item_space.z + item_space.height:
-            x_start = max(free_space.x, item_space.x)
-            x_end = min(free_space.x + free_space.width, item_space.x + item_space.width)
-            y_start = max(free_space.y, item_space.y)
-            y_end = min(free_space.y + free_space.depth, item_space.y + item_space.depth)
-            if x_end > x_start and y_end > y_start:
-                split_spaces.append(FreeSpace(
-                    x_start, y_start, item_space.z + item_space.height,
-                    x_end - x_start, y_end - y_start,
-                    (free_space.z + free_space.height) - (item_space.z + item_space.height)
-                ))
-        
-        return split_spaces
+        if fz2 > z2:
+            h = fz2 - z2
+            if h > 0.1:
+                out.append(FreeSpace(x_start, y_start, z2, w, d, h))
     
     def find_best_position(self, item_w: float, item_d: float, item_h: float, priority: int) -> Optional[Tuple[float, float, float]]:
         """Find the best position for an item using free space optimization"""
         best_position = None
         best_score = -1
+        aabbs = self._placed_aabbs
+        width, depth, height = self.width, self.depth, self.height
         
         # Try each free space
         for free_space in self.free_spaces:
             if not free_space.can_fit(item_w, item_d, item_h):
                 continue
+            
+            # The score falls with y and z, so no candidate in this space can beat
+            # its corner; skip the space if even the corner would not win
+            if self._calculate_position_score(free_space.x, free_space.y, free_space.z, priority) <= best_score:
+                continue
                 
             # Try different positions within this free space
             positions = self._generate_positions_in_space(free_space, item_w, item_d, item_h)
             
             for x, y, z in positions:
-                if self.can_place_item(x, y, z, item_w, item_d, item_h):
-                    score = self._calculate_position_score(x, y, z, priority)
-                    if score > best_score:
-                        best_score = score
-                        best_position = (x, y, z)
+                # Score first: the collision scan is only worth running for a winner
+                score = self._calculate_position_score(x, y, z, priority)
+                if score > best_score and _box_is_free(aabbs, width, depth, height,
+                                                       x, y, z, x + item_w, y + item_d, z + item_h):
+                    best_score = score
+                    best_position = (x, y, z)
         
         return best_position
     
     def _generate_positions_in_space(self, free_space: FreeSpace, item_w: float, item_d: float, item_h: float) -> List[Tuple[float, float, float]]:
         """Generate candidate positions within a free space"""
-        positions = []
-        
-        # Corner position (most stable)
-        positions.append((free_space.x, free_space.y, free_space.z))
-        
-        # Try a few strategic positions for better packing
+        # Try a few strategic positions for better packing: the corner (most
+        # stable) plus a step along each axis, where the item still fits. Each
+        # axis is independent, so the candidates are the product of the per-axis offsets.
         step_size = 10.0
         
-        # Grid positions within the free space
-        for x_offset in [0, min(step_size, free_space.width - item_w)]:
-            for y_offset in [0, min(step_size, free_space.depth - item_d)]:
-                for z_offset in [0, min(step_size, free_space.height - item_h)]:
-                    x = free_space.x + x_offset
-                    y = free_space.y + y_offset
-                    z = free_space.z + z_offset
-                    
-                    if (x + item_w <= free_space.x + free_space.width and
-                        y + item_d <= free_space.y + free_space.depth and
-                        z + item_h <= free_space.z + free_space.height):
-                        positions.append((x, y, z))
-        
-        return positions
+        fx, fy, fz = free_space.x, free_space.y, free_space.z
+        xs = [fx]
+        ys = [fy]
+        zs = [fz]
+        
+        x_offset = min(step_size, free_space.width - item_w)
+        if x_offset > 0 and fx + x_offset + item_w <= fx + free_space.width:
+            xs.append(fx + x_offset)
+        y_offset = min(step_size, free_space.depth - item_d)
+        if y_offset > 0 and fy + y_offset + item_d <= fy + free_space.depth:
+            ys.append(fy + y_offset)
+        z_offset = min(step_size, free_space.height - item_h)
+        if z_offset > 0 and fz + z_offset + item_h <= fz + free_space.height:
+            zs.append(fz + z_offset)
+        
+        return [(x, y, z) for x in xs for y in ys for z in zs]
     
     def _calculate_position_score(self, x: float, y: float, z: float, priority: int) -> float:
         """Calculate score for a position (higher is better)"""
@@ -251,42 +293,108 @@ class ContainerSpace:
         priority_score = priority
         
         return accessibility_score * 0.4 + stability_score * 0.3 + priority_score * 0.3
+
+class Point3D:
+    """Represents a point in 3D space"""
+    __slots__ = ('x', 'y', 'z')
+    
+    def __init__(self, x: float, y: float, z: float):
+        self.x = x
+        self.y = y
+        self.z = z
+    
+    def distance_to(self, other: 'Point3D') -> float:
+        """Euclidean distance to another point"""
+        return math.sqrt((self.x - other.x) ** 2 +
+                         (self.y - other.y) ** 2 +
+                         (self.z - other.z) ** 2)
+
+class Octree:
+    """Octree for efficient 3D spatial queries"""
+    __slots__ = ('center', 'half_dimension', 'max_items', 'items', 'children',
+                 '_cx', '_cy', '_cz', '_bounds')
+    
+    def __init__(self, center: Point3D, half_dimension: float, max_items: int = 10):
+        self.center = center
+        self.half_dimension = half_dimension
+        self.max_items = max_items
+        # (item_id, x1, y1, z1, x2, y2, z2) per stored box
+        self.items: List[Tuple[str, float, float, float, float, float, float]] = []
+        self.children: List['Octree'] = []
+        # The node never moves, so its center and extent are unpacked once
+        self._cx, self._cy, self._cz = center.x, center.y, center.z
+        self._bounds = (center.x - half_dimension, center.y - half_dimension, center.z - half_dimension,
+                        center.x + half_dimension, center.y + half_dimension, center.z + half_dimension)
+    
+    def insert(self, item_id: str, min_point: Point3D, max_point: Point3D) -> bool:
+        """Insert an item's bounding box; returns False if it lies outside this node"""
+        return self._insert((item_id, min_point.x, min_point.y, min_point.z,
+                             max_point.x, max_point.y, max_point.z))
+    
+    def _insert(self, entry: Tuple[str, float, float, float, float, float, float]) -> bool:
+        if not (self._contains_point(entry[1], entry[2], entry[3]) and
+                self._contains_point(entry[4], entry[5], entry[6])):
+            return False
+        
+        if not self.children and len(self.items) < self.max_items:
+            self.items.append(entry)
+            return True
+        
+        if not self.children:
+            self._subdivide()
+        
+        # Push the box down to the child that fully contains it, if any;
+        # boxes straddling child boundaries stay at this level
+        for child in self.children:
+            if child._insert(entry):
+                return True
+        
+        self.items.append(entry)
+        return True
+    
+    def _subdivide(self):
+        half = self.half_dimension / 2
+        for i in range(8):
+            center = Point3D(
+                self._cx + (half if i & 1 else -half),
+                self._cy + (half if i & 2 else -half),
+                self._cz + (half if i & 4 else -half)
             )
             self.children.append(Octree(center, half, self.max_items))
     
-    def _contains_point(self, point: Point3D) -> bool:
-        return (abs(point.x - self.center.x) <= self.half_dimension and
-                abs(point.y - self.center.y) <= self.half_dimension and
-                abs(point.z - self.center.z) <= self.half_dimension)
+    def _contains_point(self, x: float, y: float, z: float) -> bool:
+        half = self.half_dimension
+        return (abs(x - self._cx) <= half and
+                abs(y - self._cy) <= half and
+                abs(z - self._cz) <= half)
     
     def query_region(self, min_point: Point3D, max_point: Point3D) -> List[str]:
+        return self.query_bounds(min_point.x, min_point.y, min_point.z,
+                                 max_point.x, max_point.y, max_point.z)
+    
+    def query_bounds(self, x1: float, y1: float, z1: float,
+                     x2: float, y2: float, z2: float) -> List[str]:
+        """query_region on raw (x1, y1, z1)-(x2, y2, z2) coordinates"""
         results = []
-        
+        self._collect(x1, y1, z1, x2, y2, z2, results)
+        return results
+    
+    def _collect(self, x1: float, y1: float, z1: float, x2: float, y2: float, z2: float,
+                 results: List[str]):
         # Check items at this level
-        for item_id, item_min, item_max in self.items:
-            if self._boxes_intersect(min_point, max_point, item_min, item_max):
+        for item_id, ex1, ey1, ez1, ex2, ey2, ez2 in self.items:
+            if not (x2 <= ex1 or x1 >= ex2 or
+                    y2 <= ey1 or y1 >= ey2 or
+                    z2 <= ez1 or z1 >= ez2):
                 results.append(item_id)
         
-        # Check children
-        if self.children:
-            for child in self.children:
-                if child._region_intersects(min_point, max_point):
-                    results.extend(child.query_region(min_point, max_point))
-        
-        return results
-    
-    def _boxes_intersect(self, min1: Point3D, max1: Point3D, min2: Point3D, max2: Point3D) -> bool:
-        return not (max1.x <= min2.x or min1.x >= max2.x or
-                   max1.y <= min2.y or min1.y >= max2.y or
-                   max1.z <= min2.z or min1.z >= max2.z)
-    
-    def _region_intersects(self, min_point: Point3D, max_point: Point3D) -> bool:
-        return not (max_point.x <= self.center.x - self.half_dimension or
-                   min_point.x >= self.center.x + self.half_dimension or
-                   max_point.y <= self.center.y - self.half_dimension or
-                   min_point.y >= self.center.y + self.half_dimension or
-                   max_point.z <= self.center.z - self.half_dimension or
-                   min_point.z >= self.center.z + self.half_dimension)
+        # Check children whose cube the region reaches
+        for child in self.children:
+            bx1, by1, bz1, bx2, by2, bz2 = child._bounds
+            if not (x2 <= bx1 or x1 >= bx2 or
+                    y2 <= by1 or y1 >= by2 or
+                    z2 <= bz1 or z1 >= bz2):
+                child._collect(x1, y1, z1, x2, y2, z2, results)
 
 class EnhancedPlacementEngine:
     """Enhanced placement engine with advanced algorithms from archive"""
@@ -294,6 +402,10 @@ class EnhancedPlacementEngine:
     def __init__(self):
         self.grid_step = 5.0
         self.container_octrees = {}
+        # Per container: item boxes currently held by its octree (item_id -> AABB),
+        # and ids whose box falls outside the octree's cube
+        self._octree_boxes: Dict[str, Dict[str, Tuple[float, float, float, float, float, float]]] = {}
+        self._octree_overflow: Dict[str, List[str]] = {}
         self.container_spaces = {}
         
         # Priority scoring weights
@@ -311,6 +423,11 @@ class EnhancedPlacementEngine:
             'Lab': ['Laboratory', 'LAB01', 'LAB02', 'LAB03'],
             'Airlock': ['AL01', 'AL02', 'AL03']
         }
+        self._zone_aliases = {zone_key: frozenset(zone_list) for zone_key, zone_list in self.zone_mappings.items()}
+        
+        # Memoized zone affinity per (container_zone, preferred_zone):
+        # 2 = match, 1 = similar, 0 = unrelated
+        self._zone_affinity_cache: Dict[Tuple[str, str], int] = {}
     
     def find_optimal_placement(self, item: Item, containers: Dict[str, Container], 
                              placed_items: Dict[str, Item]) -> Optional[Dict]:
@@ -320,30 +437,65 @@ class EnhancedPlacementEngine:
         # Calculate enhanced priority score
         priority_score = self._calculate_enhanced_priority_score(item)
         
-        # Sort containers by preference and accessibility
-        sorted_containers = self._sort_containers_enhanced(containers, item)
+        # Bucket containers by zone so zone affinity and the placement score
+        # bound are worked out once per zone rather than once per container
+        containers_by_zone: Dict[str, List[Tuple[int, Container]]] = {}
+        for index, container in enumerate(containers.values()):
+            containers_by_zone.setdefault(container.zone, []).append((index, container))
+        
+        # Rank containers by preference and accessibility (highest _score_container
+        # first, ties in container order). They are popped from a heap so the
+        # search can stop without sorting the containers it never reaches.
+        ranked_containers = []
+        # Score bound of every unvisited container, counted per distinct bound
+        # (the bound only varies with zone affinity, so there are at most three)
+        remaining_bounds: Dict[float, int] = {}
+        for zone, bucket in containers_by_zone.items():
+            zone_affinity = self._zone_affinity(zone, item.preferredZone)
+            bound = self._placement_score_upper_bound(bucket[0][1], item, priority_score)
+            remaining_bounds[bound] = remaining_bounds.get(bound, 0) + len(bucket)
+            for index, container in bucket:
+                ranked_containers.append(
+                    (-self._score_container(container, item, zone_affinity), index, bound, container)
+                )
+        heapq.heapify(ranked_containers)
         
         best_placement = None
         best_score = -1
         
-        for container in sorted_containers:
+        # Bounding boxes of the existing items (item_id -> AABB), grouped by
+        # container in one pass
+        aabbs_by_container: Dict[str, Dict[str, Tuple[float, float, float, float, float, float]]] = {}
+        for placed_id, placed_item in placed_items.items():
+            if placed_item.position:
+                aabbs_by_container.setdefault(placed_item.containerId, {})[placed_id] = (
+                    self._item_aabb(placed_item)
+                )
+        
+        while ranked_containers:
+            # Containers are evaluated in turn and only a strictly higher score
+            # replaces the best: stop once no unvisited container can beat it,
+            # and skip any single container that cannot
+            if best_placement is not None and max(remaining_bounds) <= best_score:
+                break
+            
+            _, _, bound, container = heapq.heappop(ranked_containers)
             container_id = container.containerId
             
-            # Initialize octree for container if needed
-            if container_id not in self.container_octrees:
-                self._initialize_container_octree(container)
+            remaining_bounds[bound] -= 1
+            if not remaining_bounds[bound]:
+                del remaining_bounds[bound]
             
-            # Get existing items in this container
-            existing_items = [
-                placed_item for placed_item in placed_items.values()
-                if placed_item.containerId == container_id and placed_item.position
-            ]
+            if best_placement is not None and bound <= best_score:
+                continue
+            
+            # Bring the container's octree in line with its existing items; it is
+            # the broadphase for every orientation tried below
+            existing_aabbs = aabbs_by_container.get(container_id, {})
+            self._sync_container_octree(container, existing_aabbs)
             
             # Try orientations (only 2 for efficiency)
-            orientations = [
-                (item.width, item.depth, item.height),
-                (item.depth, item.width, item.height)
-            ]
+            orientations = self._footprint_orientations(item)
             
             for width, depth, height in orientations:
                 if (width > container.width or 
@@ -353,82 +505,109 @@ class EnhancedPlacementEngine:
                 
                 # Find position using enhanced algorithm
                 position = self._find_enhanced_position(
-                    width, depth, height, container, existing_items, priority_score
+                    width, depth, height, container, existing_aabbs, priority_score
                 )
                 
                 if position:
+                    x, y, z = position
                     # Calculate placement score
                     placement_score = self._calculate_placement_score(
-                        position, container, item, priority_score
+                        y, z, container, item, priority_score
                     )
                     
                     if placement_score > best_score:
                         best_score = placement_score
-                        best_placement = {
-                            "containerId": container_id,
-                            "position": position,
-                            "score": placement_score
-                        }
+                        best_placement = (container_id, x, y, z, width, depth, height)
         
-        return best_placement
+        if best_placement is None:
+            return None
+        
+        # Only the winner is converted to the API position format
+        container_id, x, y, z, width, depth, height = best_placement
+        return {
+            "containerId": container_id,
+            "position": self._position_dict(x, y, z, width, depth, height),
+            "score": best_score
+        }
+    
+    @staticmethod
+    def _footprint_orientations(item: Item) -> List[Tuple[float, float, float]]:
+        """Item as-is and rotated 90° on Z; a square footprint only has the one"""
+        if item.width == item.depth:
+            return [(item.width, item.depth, item.height)]
+        return [
+            (item.width, item.depth, item.height),
+            (item.depth, item.width, item.height)
+        ]
     
     def _calculate_enhanced_priority_score(self, item: Item) -> float:
         """Calculate enhanced priority score using multiple factors"""
         score = item.priority * self.priority_weight
         
         # Expiry urgency
-        if item.expiryDate and item.expiryDate != "N/A":
-            try:
-                expiry_date = datetime.fromisoformat(item.expiryDate.replace('Z', '+00:00'))
-                days_to_expiry = (expiry_date - datetime.now()).days
-                if days_to_expiry <= 7:
-                    score += 50 * self.expiry_urgency_weight
-                elif days_to_expiry <= 30:
-                    score += 25 * self.expiry_urgency_weight
-            except:
-                pass
-        
-        # Usage limit consideration
-        if hasattr(item, 'usageLimit') and item.usageLimit:
-            if item.usageLimit <= 5:
+        if item.expiryDate and item.expiryDate != "N/A" and isinstance(item.expiryDate, str):
+            expiry_date = _parse_expiry(item.expiryDate)
+            if expiry_date is not None:
+                try:
+                    days_to_expiry = (expiry_date - datetime.now()).days
+                    if days_to_expiry <= 7:
+                        score += 50 * self.expiry_urgency_weight
+                    elif days_to_expiry <= 30:
+                        score += 25 * self.expiry_urgency_weight
+                except TypeError:
+                    # Timezone-aware expiry compared against naive now
+                    pass
+        
+        # Usage limit consideration (Item always declares usageLimit)
+        usage_limit = item.usageLimit
+        if usage_limit:
+            if usage_limit <= 5:
                 score += 30
-            elif item.usageLimit <= 20:
+            elif usage_limit <= 20:
                 score += 15
         
         # Size factor (smaller items easier to place)
-        volume = item.width * item.depth * item.height
-        if volume < 1000:
+        if item.width * item.depth * item.height < 1000:
             score += 10
         
         return score
     
-    def _sort_containers_enhanced(self, containers: Dict[str, Container], 
-                                item: Item) -> List[Container]:
-        """Sort containers by enhanced preference algorithm"""
-        container_scores = []
+    def _score_container(self, container: Container, item: Item, zone_affinity: int) -> float:
+        """
+        Preference score of a container for an item (higher is tried first).
+        zone_affinity is the _zone_affinity of the container's zone.
+        """
+        score = 0
         
-        for container in containers.values():
-            score = 0
-            
-            # Zone preference with flexible matching
-            if self._zones_match(container.zone, item.preferredZone):
-                score += 1000 * self.zone_preference_weight
-            elif self._zones_similar(container.zone, item.preferredZone):
-                score += 500 * self.zone_preference_weight
-            
-            # Container size (prefer larger containers for flexibility)
-            volume = container.width * container.depth * container.height
-            score += volume / 1000
-            
-            # Accessibility (prefer containers with better access)
-            if container.depth <= 100:  # Shallow containers are more accessible
-                score += 100
-            
-            container_scores.append((score, container))
+        # Zone preference with flexible matching
+        if zone_affinity == 2:
+            score += 1000 * self.zone_preference_weight
+        elif zone_affinity == 1:
+            score += 500 * self.zone_preference_weight
         
-        # Sort by score (highest first)
-        container_scores.sort(key=lambda x: x[0], reverse=True)
-        return [container for score, container in container_scores]
+        # Container size (prefer larger containers for flexibility)
+        volume = container.width * container.depth * container.height
+        score += volume / 1000
+        
+        # Accessibility (prefer containers with better access)
+        if container.depth <= 100:  # Shallow containers are more accessible
+            score += 100
+        
+        return score
+    
+    def _zone_affinity(self, container_zone: str, preferred_zone: str) -> int:
+        """Memoized zone relation: 2 if the zones match, 1 if similar, 0 otherwise"""
+        key = (container_zone, preferred_zone)
+        affinity = self._zone_affinity_cache.get(key)
+        if affinity is None:
+            if self._zones_match(container_zone, preferred_zone):
+                affinity = 2
+            elif self._zones_similar(container_zone, preferred_zone):
+                affinity = 1
+            else:
+                affinity = 0
+            self._zone_affinity_cache[key] = affinity
+        return affinity
     
     def _zones_match(self, container_zone: str, preferred_zone: str) -> bool:
         """Check if zones match exactly or through mappings"""
@@ -436,19 +615,14 @@ class EnhancedPlacementEngine:
             return True
         
         # Check zone mappings
-        for zone_key, zone_list in self.zone_mappings.items():
-            if preferred_zone == zone_key and container_zone in zone_list:
-                return True
-            if container_zone == zone_key and preferred_zone in zone_list:
-                return True
-        
-        return False
+        return (container_zone in self._zone_aliases.get(preferred_zone, ()) or
+                preferred_zone in self._zone_aliases.get(container_zone, ()))
     
     def _zones_similar(self, container_zone: str, preferred_zone: str) -> bool:
         """Check if zones are similar (partial match)"""
         # Normalize zone names
-        container_normalized = container_zone.lower().replace('_', '').replace(' ', '')
-        preferred_normalized = preferred_zone.lower().replace('_', '').replace(' ', '')
+        container_normalized = _normalize_zone(container_zone)
+        preferred_normalized = _normalize_zone(preferred_zone)
         
         # Check for partial matches
         if (container_normalized in preferred_normalized or 
@@ -468,108 +642,181 @@ class EnhancedPlacementEngine:
         """Initialize octree for container"""
         center = Point3D(container.width/2, container.depth/2, container.height/2)
         max_dimension = max(container.width, container.depth, container.height)
-        self.container_octrees[container.containerId] = Octree(center, max_dimension/2)
+        self.container_octrees[container.containerId] = Octree(center, max_dimension/2, max_items=8)
+        self._octree_boxes[container.containerId] = {}
+        self._octree_overflow[container.containerId] = []
+    
+    def _sync_container_octree(self, container: Container,
+                               existing_aabbs: Dict[str, Tuple[float, float, float, float, float, float]]):
+        """Make the container's octree hold exactly the given item boxes"""
+        container_id = container.containerId
+        indexed = self._octree_boxes.get(container_id)
+        
+        # The octree only supports insertion, so start over if any indexed item
+        # has since moved or been removed
+        if indexed is None or any(existing_aabbs.get(item_id) != aabb for item_id, aabb in indexed.items()):
+            self._initialize_container_octree(container)
+            indexed = self._octree_boxes[container_id]
+        
+        octree = self.container_octrees[container_id]
+        overflow = self._octree_overflow[container_id]
+        for item_id, aabb in existing_aabbs.items():
+            if item_id in indexed:
+                continue
+            indexed[item_id] = aabb
+            if not octree.insert(item_id, Point3D(aabb[0], aabb[1], aabb[2]), Point3D(aabb[3], aabb[4], aabb[5])):
+                overflow.append(item_id)
     
     def _find_enhanced_position(self, item_width: float, item_depth: float, item_height: float,
-                              container: Container, existing_items: List[Item], 
-                              priority_score: float) -> Optional[Dict]:
-        """Find position using enhanced algorithm with accessibility optimization"""
+                              container: Container,
+                              existing_aabbs: Dict[str, Tuple[float, float, float, float, float, float]],
+                              priority_score: float) -> Optional[Tuple[int, int, int]]:
+        """
+        Find position using enhanced algorithm with accessibility optimization.
+        Returns the (x, y, z) start corner on the placement grid, or None.
+        The container's octree must already hold existing_aabbs (see _sync_container_octree).
+        """
         
         # For high priority items, try accessible positions first
         if priority_score > 150:
             # Try positions near opening (low depth) first
-            depth_order = [0, 5, 10, 15, 20]
+            depth_order = [y for y in (0, 5, 10, 15, 20) if y + item_depth <= container.depth]
         else:
             # Regular order for normal priority items
-            depth_order = list(range(0, int(container.depth - item_depth) + 1, int(self.grid_step)))
+            depth_order = _grid_axis(container.depth, item_depth, int(self.grid_step))
+        
+        # Candidate coordinates along the other axes. _grid_axis only drops a
+        # tail of the raster, so x_positions[i] is still i * step.
+        step = int(self.grid_step)
+        z_positions = _grid_axis(container.height, item_height, step)
+        x_positions = _grid_axis(container.width, item_width, step)
+        x_count = len(x_positions)
+        octree = self.container_octrees[container.containerId]
+        overflow = [existing_aabbs[item_id] for item_id in self._octree_overflow[container.containerId]]
         
         for y in depth_order:
-            if y + item_depth > container.depth:
-                continue
+            y2 = y + item_depth
                 
             # Try positions with accessibility preference
-            for z in range(0, int(container.height - item_height) + 1, int(self.grid_step)):
-                for x in range(0, int(container.width - item_width) + 1, int(self.grid_step)):
+            for z in z_positions:
+                z2 = z + item_height
+                
+                # Broadphase: only items overlapping this depth/height row can
+                # collide anywhere along it
+                slab = [
+                    existing_aabbs[item_id]
+                    for item_id in octree.query_bounds(-math.inf, y, z, math.inf, y2, z2)
+                ]
+                slab.extend(
+                    aabb for aabb in overflow
+                    if not (y2 <= aabb[1] or y >= aabb[4] or z2 <= aabb[2] or z >= aabb[5])
+                )
+                
+                # Walk the x raster in order, but after a collision jump straight
+                # to the first grid x past every colliding item - the same boxes
+                # would reject all the positions in between
+                x_index = 0
+                while x_index < x_count:
+                    x = x_positions[x_index]
+                    x_index += 1
                     
-                    # Quick bounds check
-                    if (x + item_width > container.width or
-                        y + item_depth > container.depth or
-                        z + item_height > container.height):
+                    # Enhanced collision detection
+                    x2 = x + item_width
+                    blocked_until = max(
+                        (aabb[3] for aabb in slab if not (x2 <= aabb[0] or x >= aabb[3])),
+                        default=None
+                    )
+                    if blocked_until is not None:
+                        x_index = max(x_index, math.ceil(blocked_until / step))
                         continue
                     
-                    # Enhanced collision detection
-                    if self._is_position_valid_enhanced(
-                        x, y, z, item_width, item_depth, item_height, 
-                        container.containerId, existing_items):
-                        
-                        return {
-                            "startCoordinates": {
-                                "width": float(x),
-                                "depth": float(y),
-                                "height": float(z)
-                            },
-                            "endCoordinates": {
-                                "width": float(x + item_width),
-                                "depth": float(y + item_depth),
-                                "height": float(z + item_height)
-                            }
-                        }
+                    return x, y, z
         
         return None
     
+    @staticmethod
+    def _position_dict(x: float, y: float, z: float,
+                       width: float, depth: float, height: float) -> Dict:
+        """Position in API format for an item of the given size placed at (x, y, z)"""
+        return {
+            "startCoordinates": {
+                "width": float(x),
+                "depth": float(y),
+                "height": float(z)
+            },
+            "endCoordinates": {
+                "width": float(x + width),
+                "depth": float(y + depth),
+                "height": float(z + height)
+            }
+        }
+    
+    @staticmethod
+    def _item_aabb(item: Item) -> Tuple[float, float, float, float, float, float]:
+        """Extract the (x1, y1, z1, x2, y2, z2) box from a placed item's position dict"""
+        start = item.position["startCoordinates"]
+        end = item.position["endCoordinates"]
+        return (start["width"], start["depth"], start["height"],
+                end["width"], end["depth"], end["height"])
+    
+    @staticmethod
+    def _build_aabb_table(existing_items: List[Item]) -> List[Tuple[float, float, float, float, float, float]]:
+        """Extract (x1, y1, z1, x2, y2, z2) boxes from placed items' position dicts"""
+        return [EnhancedPlacementEngine._item_aabb(item) for item in existing_items if item.position]
+    
     def _is_position_valid_enhanced(self, x: float, y: float, z: float,
                                   width: float, depth: float, height: float,
-                                  container_id: str, existing_items: List[Item]) -> bool:
+                                  container_id: str,
+                                  existing_aabbs: List[Tuple[float, float, float, float, float, float]]) -> bool:
         """Enhanced collision detection using octree when available"""
         
         # Fast AABB collision detection
-        x1, y1, z1 = x, y, z
-        x2, y2, z2 = x + width, y + depth, z + height
-        
-        for item in existing_items:
-            if not item.position:
-                continue
-                
-            start = item.position["startCoordinates"]
-            end = item.position["endCoordinates"]
-            
-            ex1, ey1, ez1 = start["width"], start["depth"], start["height"]
-            ex2, ey2, ez2 = end["width"], end["depth"], end["height"]
-            
-            # AABB intersection test
-            if not (x2 <= ex1 or x1 >= ex2 or
-                   y2 <= ey1 or y1 >= ey2 or
-                   z2 <= ez1 or z1 >= ez2):
-                return False
-        
-        return True
+        return not _any_overlap(existing_aabbs, x, y, z, x + width, y + depth, z + height)
     
-    def _calculate_placement_score(self, position: Dict, container: Container, 
+    def _calculate_placement_score(self, y: float, z: float, container: Container, 
                                  item: Item, priority_score: float) -> float:
-        """Calculate placement score for position optimization"""
+        """Calculate placement score for position optimization (y, z: start depth and height)"""
         score = 0
         
-        start = position["startCoordinates"]
-        
         # Accessibility score (lower depth = better)
-        depth_score = (1.0 - start["depth"] / container.depth) * self.accessibility_weight * 100
+        depth_score = (1.0 - y / container.depth) * self.accessibility_weight * 100
         score += depth_score
         
         # Priority bonus
         score += priority_score * 0.1
         
         # Zone preference
-        if self._zones_match(container.zone, item.preferredZone):
+        zone_affinity = self._zone_affinity(container.zone, item.preferredZone)
+        if zone_affinity == 2:
             score += 100 * self.zone_preference_weight
-        elif self._zones_similar(container.zone, item.preferredZone):
+        elif zone_affinity == 1:
             score += 50 * self.zone_preference_weight
         
         # Stability preference (lower height = more stable)
-        if start["height"] < container.height * 0.3:
+        if z < container.height * 0.3:
             score += 20
         
         return score
     
+    def _placement_score_upper_bound(self, container: Container, item: Item,
+                                     priority_score: float) -> float:
+        """
+        Highest score _calculate_placement_score can give in this container: a
+        front position (depth 0) that also earns the stability bonus. Built in
+        the same order, so it is never below a real score.
+        """
+        score = 0
+        score += 1.0 * self.accessibility_weight * 100
+        score += priority_score * 0.1
+        
+        zone_affinity = self._zone_affinity(container.zone, item.preferredZone)
+        if zone_affinity == 2:
+            score += 100 * self.zone_preference_weight
+        elif zone_affinity == 1:
+            score += 50 * self.zone_preference_weight
+        
+        return score + 20
+    
     def validate_placement(self, item: Item, container: Container, 
                           position: Dict, existing_items: Dict[str, Item]) -> Tuple[bool, str]:
         """Enhanced validation"""
@@ -589,10 +836,7 @@ class EnhancedPlacementEngine:
             placed_depth = end["depth"] - start["depth"]
             placed_height = end["height"] - start["height"]
             
-            valid_orientations = [
-                (item.width, item.depth, item.height),
-                (item.depth, item.width, item.height)
-            ]
+            valid_orientations = self._footprint_orientations(item)
             
             orientation_match = any(
                 abs(placed_width - w) < 0.1 and 
@@ -613,7 +857,7 @@ class EnhancedPlacementEngine:
             if not self._is_position_valid_enhanced(
                 start["width"], start["depth"], start["height"],
                 placed_width, placed_depth, placed_height,
-                container.containerId, container_items
+                container.containerId, self._build_aabb_table(container_items)
             ):
                 return False, "Item placement collides with existing items"
             
@@ -11,11 +11,69 @@ from typing import List, Dict, Optional, Tuple, Set
 import math
 import time
 import heapq
+import logging
+from functools import lru_cache
 from backend.models.item import Item
 from backend.models.container import Container
 
+logger = logging.getLogger(__name__)
+
+# Keyword-based matching for common zone types
+_ZONE_KEYWORDS = {
+    'lab': ['lab', 'research', 'science', 'experiment'],
+    'storage': ['storage', 'bay', 'cargo', 'warehouse'],
+    'maintenance': ['maintenance', 'engineering', 'repair', 'workshop'],
+    'crew': ['crew', 'quarters', 'living', 'personal'],
+    'medical': ['medical', 'health', 'hospital', 'clinic'],
+    'airlock': ['airlock', 'entry', 'exit', 'docking'],
+    'cockpit': ['cockpit', 'bridge', 'control', 'command']
+}
+
+@lru_cache(maxsize=1024)
+def _zone_profile(zone: str) -> Tuple[str, frozenset]:
+    """
+    Memoized (normalized name, zone types whose keywords it contains) for a
+    zone string. A name can hit several types, e.g. 'Crew_Bay'.
+    """
+    clean = zone.lower().replace('_', '').replace(' ', '').replace('-', '')
+    zone_types = frozenset(
+        zone_type for zone_type, keywords in _ZONE_KEYWORDS.items()
+        if any(keyword in clean for keyword in keywords)
+    )
+    return clean, zone_types
+
+@lru_cache(maxsize=4096)
+def _item_priority_score(priority: int, width: float, depth: float, height: float) -> float:
+    """
+    Memoized item ordering score for place_items. It depends only on these
+    fields, so repeated batches and same-sized cargo reuse it.
+    """
+    score = priority * 100  # Base priority
+    
+    # Size factor (smaller items first for better packing)
+    volume = width * depth * height
+    if volume < 1000:  # Small items
+        score += 50
+    elif volume > 10000:  # Large items (place early)
+        score += 25
+    
+    return score
+
+def _any_overlap(aabbs: List[Tuple[float, float, float, float, float, float]],
+                 x1: float, y1: float, z1: float, x2: float, y2: float, z2: float) -> bool:
+    """Narrow phase for ContainerSpace: does the box hit any of the (grid-filtered) AABBs"""
+    for ex1, ey1, ez1, ex2, ey2, ez2 in aabbs:
+        # Check for overlap on all three axes
+        if not (x2 <= ex1 or x1 >= ex2 or
+                y2 <= ey1 or y1 >= ey2 or
+                z2 <= ez1 or z1 >= ez2):
+            return True
+    return False
+
 class FreeSpace:
     """Represents a block of free space in 3D"""
+    __slots__ = ('x', 'y', 'z', 'width', 'depth', 'height')
+    
     def __init__(self, x: float, y: float, z: float, width: float, depth: float, height: float):
         self.x = x
         self.y = y
@@ -36,6 +94,8 @@ class FreeSpace:
 
 class PlacedItem:
     """Represents an item that has been placed in 3D space"""
+    __slots__ = ('x', 'y', 'z', 'width', 'depth', 'height', 'item_id', '_aabb')
+    
     def __init__(self, x: float, y: float, z: float, width: float, depth: float, height: float, item_id: str):
         self.x = x
         self.y = y
@@ -44,11 +104,12 @@ class PlacedItem:
         self.depth = depth
         self.height = height
         self.item_id = item_id
+        # Bounds are fixed once placed, so build the AABB tuple a single time
+        self._aabb = (x, y, z, x + width, y + depth, z + height)
         
     def get_aabb(self) -> Tuple[float, float, float, float, float, float]:
         """Get axis-aligned bounding box coordinates (x1, y1, z1, x2, y2, z2)"""
-        return (self.x, self.y, self.z, 
-                self.x + self.width, self.y + self.depth, self.z + self.height)
+        return self._aabb
 
 class ContainerSpace:
     """Advanced 3D space management for a single container"""
@@ -57,8 +118,36 @@ class ContainerSpace:
         self.depth = depth
         self.height = height
         self.placed_items: List[PlacedItem] = []
+        # AABBs of placed_items (x1, y1, z1, x2, y2, z2), index-aligned, for collision scans
+        self._placed_aabbs: List[Tuple[float, float, float, float, float, float]] = []
         self.free_spaces: List[FreeSpace] = [FreeSpace(0, 0, 0, width, depth, height)]
         
+        # Uniform grid broadphase: cell -> indices into _placed_aabbs of the
+        # items whose box touches that cell
+        self._cell_size = max(width, depth, height) / 16 or 1.0
+        self._grid: Dict[Tuple[int, int, int], List[int]] = {}
+        
+        # free_volume cache and the free_spaces list it was summed from
+        self._free_volume = 0.0
+        self._free_volume_of: Optional[List[FreeSpace]] = None
+    
+    @property
+    def free_volume(self) -> float:
+        """Total volume of free_spaces, re-summed only after the list is replaced"""
+        free_spaces = self.free_spaces
+        if self._free_volume_of is not free_spaces:
+            self._free_volume = sum(fs.volume for fs in free_spaces)
+            self._free_volume_of = free_spaces
+        return self._free_volume
+    
+    def _cell_span(self, x1: float, y1: float, z1: float,
+                   x2: float, y2: float, z2: float) -> Tuple[range, range, range]:
+        """Grid cell index ranges along each axis covered by a box"""
+        cell = self._cell_size
+        return (range(int(x1 // cell), int(x2 // cell) + 1),
+                range(int(y1 // cell), int(y2 // cell) + 1),
+                range(int(z1 // cell), int(z2 // cell) + 1))
+        
     def can_place_item(self, x: float, y: float, z: float, width: float, depth: float, height: float) -> bool:
         """Check if an item can be placed at the specified position using AABB collision detection"""
         # Boundary check
@@ -68,162 +157,157 @@ class ContainerSpace:
             z + height > self.height):
             return False
         
-        # AABB collision detection
-        new_x1, new_y1, new_z1 = x, y, z
-        new_x2, new_y2, new_z2 = x + width, y + depth, z + height
-        
-        for placed_item in self.placed_items:
-            placed_x1, placed_y1, placed_z1, placed_x2, placed_y2, placed_z2 = placed_item.get_aabb()
-            
-            # Check for overlap on all three axes
-            if not (new_x2 <= placed_x1 or new_x1 >= placed_x2 or
-                    new_y2 <= placed_y1 or new_y1 >= placed_y2 or
-                    new_z2 <= placed_z1 or new_z1 >= placed_z2):
-                return False
-        
-        return True
+        # AABB collision detection, narrowed to the items sharing a grid cell
+        # with the box. Boxes that overlap always share a cell.
+        x2, y2, z2 = x + width, y + depth, z + height
+        aabbs = self._placed_aabbs
+        xs, ys, zs = self._cell_span(x, y, z, x2, y2, z2)
+        if len(xs) * len(ys) * len(zs) >= len(aabbs):
+            # Large box relative to the item count: a straight scan is cheaper
+            return not _any_overlap(aabbs, x, y, z, x2, y2, z2)
+        
+        grid = self._grid
+        candidates = set()
+        for ix in xs:
+            for iy in ys:
+                for iz in zs:
+                    bucket = grid.get((ix, iy, iz))
+                    if bucket:
+                        candidates.update(bucket)
+        return not _any_overlap([aabbs[i] for i in candidates], x, y, z, x2, y2, z2)
         
     def place_item(self, x: float, y: float, z: float, width: float, depth: float, height: float, item_id: str) -> bool:
-        """Place an item and update space management - simplified version"""
+        """Place an item and update space management"""
         if not self.can_place_item(x, y, z, width, depth, height):
             return False
             
         # Add to placed items
         placed_item = PlacedItem(x, y, z, width, depth, height, item_id)
         self.placed_items.append(placed_item)
+        self._placed_aabbs.append(placed_item.get_aabb())
         
-        # Simplified free space update - just remove the largest overlapping free space
-        new_free_spaces = []
-        for free_space in self.free_spaces:
-            if not self._spaces_overlap(free_space, FreeSpace(x, y, z, width, depth, height)):
-                new_free_spaces.append(free_space)
+        index = len(self._placed_aabbs) - 1
+        xs, ys, zs = self._cell_span(*placed_item.get_aabb())
+        for ix in xs:
+            for iy in ys:
+                for iz in zs:
+                    self._grid.setdefault((ix, iy, iz), []).append(index)
         
-        self.free_spaces = new_free_spaces
+        # Split the free spaces around the item so they keep tracking the empty volume
+        self._update_free_spaces(x, y, z, width, depth, height)
         return True
         
     def _update_free_spaces(self, x: float, y: float, z: float, width: float, depth: float, height: float):
         """Update free spaces after placing an item"""
-        item_space = FreeSpace(x, y, z, width, depth, height)
         new_free_spaces = []
         
+        # Spaces that the item box does not touch are kept as they are; the
+        # rest are replaced by the pieces left around the item
+        x2, y2, z2 = x + width, y + depth, z + height
+        
         for free_space in self.free_spaces:
-            if self._spaces_overlap(free_space, item_space):
+            fx, fy, fz = free_space.x, free_space.y, free_space.z
+            if not (fx + free_space.width <= x or x2 <= fx or
+                    fy + free_space.depth <= y or y2 <= fy or
+                    fz + free_space.height <= z or z2 <= fz):
                 # Split the free space around the item
-                split_spaces = self._split_free_space(free_space, item_space)
-                new_free_spaces.extend(split_spaces)
-            else:
+                self._split_free_space(free_space, x, y, z, x2, y2, z2, new_free_spaces)
+            elif free_space.width > 0.1 and free_space.depth > 0.1 and free_space.height > 0.1:
                 new_free_spaces.append(free_space)
         
-        # Filter out tiny spaces
-        self.free_spaces = [fs for fs in new_free_spaces 
-                           if fs.width > 0.1 and fs.depth > 0.1 and fs.height > 0.1]
-    
-    def _spaces_overlap(self, space1: FreeSpace, space2: FreeSpace) -> bool:
-        """Check if two 3D spaces overlap"""
-        return not (space1.x + space1.width <= space2.x or 
-                   space2.x + space2.width <= space1.x or
-                   space1.y + space1.depth <= space2.y or 
-                   space2.y + space2.depth <= space1.y or
-                   space1.z + space1.height <= space2.z or 
-                   space2.z + space2.height <= space1.z)
+        self.free_spaces = new_free_spaces
     
-    def _split_free_space(self, free_space: FreeSpace, item_space: FreeSpace) -> List[FreeSpace]:
-        """Split a free space around an item space"""
-        split_spaces = []
+    def _split_free_space(self, free_space: FreeSpace,
+                          x1: float, y1: float, z1: float, x2: float, y2: float, z2: float,
+                          out: List[FreeSpace]):
+        """
+        Append to out the parts of free_space left around the item box
+        (x1, y1, z1)-(x2, y2, z2), skipping any no thicker than 0.1 on an axis
+        """
+        fx, fy, fz = free_space.x, free_space.y, free_space.z
+        fw, fd, fh = free_space.width, free_space.depth, free_space.height
+        fx2, fy2, fz2 = fx + fw, fy + fd, fz + fh
         
         # Create up to 6 new free spaces around the placed item
         # Left
-        if item_space.x > free_space.x:
-            split_spaces.append(FreeSpace(
-                free_space.x, free_space.y, free_space.z,
-                item_space.x - free_space.x, free_space.depth, free_space.height
-            ))
+        if x1 > fx:
+            w = x1 - fx
+            if w > 0.1 and fd > 0.1 and fh > 0.1:
+                out.append(FreeSpace(fx, fy, fz, w, fd, fh))
         
         # Right
-        if free_space.x + free_space.width > item_space.x + item_space.width:
-            split_spaces.append(FreeSpace(
-                item_space.x + item_space.width, free_space.y, free_space.z,
-                (free_space.x + free_space.width) - (item_space.x + item_space.width),
-                free_space.depth, free_space.height
-            ))
+        if fx2 > x2:
+            w = fx2 - x2
+            if w > 0.1 and fd > 0.1 and fh > 0.1:
+                out.append(FreeSpace(x2, fy, fz, w, fd, fh))
+        
+        # Front/back pieces only span the item's x range, bottom/top its x and y range
+        x_start = max(fx, x1)
+        x_end = min(fx2, x2)
+        if not x_end > x_start:
+            return
+        w = x_end - x_start
+        if not w > 0.1:
+            return
         
         # Front (within x bounds)
-        if item_space.y > free_space.y:
-            x_start = max(free_space.x, item_space.x)
-            x_end = min(free_space.x + free_space.width, item_space.x + item_space.width)
-            if x_end > x_start:
-                split_spaces.append(FreeSpace(
-                    x_start, free_space.y, free_space.z,
-                    x_end - x_start, item_space.y - free_space.y, free_space.height
-                ))
+        if y1 > fy:
+            d = y1 - fy
+            if d > 0.1 and fh > 0.1:
+                out.append(FreeSpace(x_start, fy, fz, w, d, fh))
         
         # Back (within x bounds)
-        if free_space.y + free_space.depth > item_space.y + item_space.depth:
-            x_start = max(free_space.x, item_space.x)
-            x_end = min(free_space.x + free_space.width, item_space.x + item_space.width)
-            if x_end > x_start:
-                split_spaces.append(FreeSpace(
-                    x_start, item_space.y + item_space.depth, free_space.z,
-                    x_end - x_start,
-                    (free_space.y + free_space.depth) - (item_space.y + item_space.depth),
-                    free_space.height
-                ))
+        if fy2 > y2:
+            d = fy2 - y2
+            if d > 0.1 and fh > 0.1:
+                out.append(FreeSpace(x_start, y2, fz, w, d, fh))
+        
+        y_start = max(fy, y1)
+        y_end = min(fy2, y2)
+        if not y_end > y_start:
+            return
+        d = y_end - y_start
+        if not d > 0.1:
+            return
         
         # Bottom (within x,y bounds)
-        if item_space.z > free_space.z:
-            x_start = max(free_space.x, item_space.x)
-            x_end = min(free_space.x + free_space.width, item_space.x + item_space.width)
-            y_start = max(free_space.y, item_space.y)
-            y_end = min(free_space.y + free_space.depth, item_space.y + item_space.depth)
-            if x_end > x_start and y_end > y_start:
-                split_spaces.append(FreeSpace(
-                    x_start, y_start, free_space.z,
-                    x_end - x_start, y_end - y_start, item_space.z - free_space.z
-                ))
+        if z1 > fz:
+            h = z1 - fz
+            if h > 0.1:
+                out.append(FreeSpace(x_start, y_start, fz, w, d, h))
         
         # Top (within x,y bounds)
-        if free_space.z + free_space.height > item_space.z + item_space.height:
-            x_start = max(free_space.x, item_space.x)
-            x_end = min(free_space.x + free_space.width, item_space.x + item_space.width)
-            y_start = max(free_space.y, item_space.y)
-            y_end = min(free_space.y + free_space.depth, item_space.y + item_space.depth)
-            if x_end > x_start and y_end > y_start:
-                split_spaces.append(FreeSpace(
-                    x_start, y_start, item_space.z + item_space.height,
-                    x_end - x_start, y_end - y_start,
-                    (free_space.z + free_space.height) - (item_space.z + item_space.height)
-                ))
-        
-        return split_spaces
+        if fz2 > z2:
+            h = fz2 - z2
+            if h > 0.1:
+                out.append(FreeSpace(x_start, y_start, z2, w, d, h))
     
     def find_best_position(self, item_w: float, item_d: float, item_h: float, priority: int) -> Optional[Tuple[float, float, float]]:
-        """Find the best position for an item using simplified logic initially"""
-        # First check if item fits at origin
+        """Find the best position for an item at the corner of a free space that fits it"""
+        # First check if item fits at origin (the best-scoring position)
         if self.can_place_item(0, 0, 0, item_w, item_d, item_h):
             return (0.0, 0.0, 0.0)
         
-        # Try grid positions
-        step_size = 10.0
-        max_x = max(0, self.width - item_w)
-        max_y = max(0, self.depth - item_d)
-        max_z = max(0, self.height - item_h)
-        
-        best_position = None
-        best_score = -1
-        
-        # Try positions in a grid
-        for z in [0, min(step_size, max_z)]:
-            for y in [0, min(step_size, max_y), min(step_size * 2, max_y)]:
-                for x in [0, min(step_size, max_x), min(step_size * 2, max_x)]:
-                    if (x <= max_x and y <= max_y and z <= max_z and
-                        self.can_place_item(x, y, z, item_w, item_d, item_h)):
-                        
-                        score = self._calculate_position_score(x, y, z, priority)
-                        if score > best_score:
-                            best_score = score
-                            best_position = (x, y, z)
-        
-        return best_position
+        # Score the bottom-left-front corner of each free space large enough for
+        # the item (only scores above -1 are accepted), then collision-test them
+        # best first; ties go to the earlier free space. The first corner that
+        # passes is the best position, so usually only one scan is needed.
+        candidates = []
+        for index, free_space in enumerate(self.free_spaces):
+            if not free_space.can_fit(item_w, item_d, item_h):
+                continue
+            x, y, z = free_space.x, free_space.y, free_space.z
+            score = self._calculate_position_score(x, y, z, priority)
+            if score > -1:
+                candidates.append((-score, index, x, y, z))
+        heapq.heapify(candidates)
+        
+        while candidates:
+            _, _, x, y, z = heapq.heappop(candidates)
+            if self.can_place_item(x, y, z, item_w, item_d, item_h):
+                return (x, y, z)
+        
+        return None
     
     def _generate_positions_in_space(self, free_space: FreeSpace, item_w: float, item_d: float, item_h: float) -> List[Tuple[float, float, float]]:
         """Generate candidate positions within a free space"""
@@ -269,36 +353,69 @@ class EnhancedPlacementEngine:
     def __init__(self):
         self.container_spaces: Dict[str, ContainerSpace] = {}
         self.containers_data: Dict[str, Container] = {}
+        # Memoized _is_zone_match results per (preferred, container_zone)
+        self._zone_match_cache: Dict[Tuple[str, str], bool] = {}
         
     def find_optimal_placement(self, item: Item, containers: Dict[str, Container], 
                              placed_items: Dict[str, Item]) -> Optional[Dict]:
         """Find optimal placement using enhanced algorithms"""
+        # Per-container tracing is only built when DEBUG logging is on
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Placing item %s with dimensions %sx%sx%s",
+                         item.itemId, item.width, item.depth, item.height)
         
         # Initialize container spaces if needed
         self._initialize_container_spaces(containers)
         
         # Get valid orientations
-        orientations = [
-            (item.width, item.depth, item.height),  # Original
-            (item.depth, item.width, item.height)   # 90° rotation
-        ]
+        orientations = self._footprint_orientations(item)
         
         # Sort containers by suitability
         sorted_containers = self._sort_containers_by_suitability(containers, item)
         
-        best_placement = None
+        # Best (container_id, x, y, z, width, depth, height) found so far
+        best_record = None
         best_score = -1
         
-        for container in sorted_containers:
+        # Zone and priority terms of the placement score are the same for every
+        # position in a container. Positions are never negative, so adding the
+        # position score at the origin gives the best score the container could
+        # reach; remaining_best[i] is the highest such bound from container i onwards.
+        position_best = self._position_score(0.0, 0.0)
+        score_bases = [self._placement_score_base(item, container) for container in sorted_containers]
+        remaining_best = [base + position_best for base in score_bases]
+        for i in range(len(remaining_best) - 2, -1, -1):
+            remaining_best[i] = max(remaining_best[i], remaining_best[i + 1])
+        
+        for i, container in enumerate(sorted_containers):
+            score_base = score_bases[i]
+            
+            # Only a strictly higher score replaces the best: stop once no
+            # remaining container can beat it, and skip one that cannot
+            if best_record is not None:
+                if remaining_best[i] <= best_score:
+                    if debug:
+                        logger.debug("No remaining container can beat score %s", best_score)
+                    break
+                if score_base + position_best <= best_score:
+                    continue
+            
             container_id = container.containerId
             container_space = self.container_spaces.get(container_id)
             
             if not container_space:
+                if debug:
+                    logger.debug("No container space for %s", container_id)
                 continue
             
-            # Try each orientation
+            # Try each orientation that fits inside the container
+            container_width, container_depth, container_height = container.width, container.depth, container.height
             for width, depth, height in orientations:
-                if not self._fits_in_container(width, depth, height, container):
+                if width > container_width or depth > container_depth or height > container_height:
+                    if debug:
+                        logger.debug("Orientation %sx%sx%s doesn't fit in container %s",
+                                     width, depth, height, container_id)
                     continue
                 
                 # Find best position in this container
@@ -306,132 +423,63 @@ class EnhancedPlacementEngine:
                 
                 if position:
                     x, y, z = position
-                    # Calculate overall placement score
-                    placement_score = self._calculate_placement_score(
-                        item, container, x, y, z
-                    )
+                    # Calculate overall placement score (see _calculate_placement_score)
+                    placement_score = score_base + self._position_score(y, z)
+                    if debug:
+                        logger.debug("Container %s, orientation %sx%sx%s: position (%s, %s, %s), score %s",
+                                     container_id, width, depth, height, x, y, z, placement_score)
                     
                     if placement_score > best_score:
                         best_score = placement_score
-                        best_placement = {
-                            "containerId": container_id,
-                            "position": {
-                                "startCoordinates": {
-                                    "width": float(x),
-                                    "depth": float(y),
-                                    "height": float(z)
-                                },
-                                "endCoordinates": {
-                                    "width": float(x + width),
-                                    "depth": float(y + depth),
-                                    "height": float(z + height)
-                                }
-                            }
-                        }
-        
-        # If placement found, update container space
-        if best_placement:
-            container_id = best_placement["containerId"]
-            pos = best_placement["position"]
-            start = pos["startCoordinates"]
-            end = pos["endCoordinates"]
-            
-            width = end["width"] - start["width"]
-            depth = end["depth"] - start["depth"]
-            height = end["height"] - start["height"]
+                        best_record = (container_id, x, y, z, width, depth, height)
+        
+        best_placement = None
+        
+        # If placement found, build it in API format and update container space
+        if best_record is not None:
+            container_id, x, y, z, width, depth, height = best_record
+            best_placement = {
+                "containerId": container_id,
+                "position": {
+                    "startCoordinates": {
+                        "width": float(x),
+                        "depth": float(y),
+                        "height": float(z)
+                    },
+                    "endCoordinates": {
+                        "width": float(x + width),
+                        "depth": float(y + depth),
+                        "height": float(z + height)
+                    }
+                }
+            }
             
+            # Record the box exactly as returned to the caller
+            start = best_placement["position"]["startCoordinates"]
+            end = best_placement["position"]["endCoordinates"]
             self.container_spaces[container_id].place_item(
                 start["width"], start["depth"], start["height"],
-                width, depth, height, item.itemId
+                end["width"] - start["width"], end["depth"] - start["depth"], end["height"] - start["height"],
+                item.itemId
             )
         
+        if debug:
+            if best_placement:
+                logger.debug("Best placement for item %s: %s", item.itemId, best_placement)
+            else:
+                logger.debug("No placement found for item %s", item.itemId)
+        
         return best_placement
     
-    def find_optimal_placement_debug(self, item: Item, containers: Dict[str, Container], 
-                             placed_items: Dict[str, Item]) -> Optional[Dict]:
-        """Debug version of find_optimal_placement"""
-        print(f"DEBUG: Placing item {item.itemId} with dimensions {item.width}x{item.depth}x{item.height}")
-        
-        # Initialize container spaces if needed
-        self._initialize_container_spaces(containers)
-        print(f"DEBUG: Initialized {len(self.container_spaces)} container spaces")
-        
-        # Get valid orientations
-        orientations = [
+    @staticmethod
+    def _footprint_orientations(item: Item) -> List[Tuple[float, float, float]]:
+        """Orientations tried by find_optimal_placement (no duplicate for square items)"""
+        if item.width == item.depth:
+            return [(item.width, item.depth, item.height)]  # Original
+        return [
             (item.width, item.depth, item.height),  # Original
             (item.depth, item.width, item.height)   # 90° rotation
         ]
-        print(f"DEBUG: Trying {len(orientations)} orientations: {orientations}")
-        
-        # Sort containers by suitability
-        sorted_containers = self._sort_containers_by_suitability(containers, item)
-        print(f"DEBUG: Sorted {len(sorted_containers)} containers by suitability")
-        
-        best_placement = None
-        best_score = -1
-        
-        for i, container in enumerate(sorted_containers):
-            container_id = container.containerId
-            container_space = self.container_spaces.get(container_id)
-            print(f"DEBUG: Trying container {i+1}/{len(sorted_containers)}: {container_id}")
-            
-            if not container_space:
-                print(f"DEBUG: No container space for {container_id}")
-                continue
-            
-            suitability_score = self._calculate_container_suitability(container, item)
-            print(f"DEBUG: Container {container_id} suitability score: {suitability_score}")
-            
-            # Try each orientation
-            for j, (width, depth, height) in enumerate(orientations):
-                print(f"DEBUG: Trying orientation {j+1}: {width}x{depth}x{height}")
-                
-                if not self._fits_in_container(width, depth, height, container):
-                    print(f"DEBUG: Orientation {j+1} doesn't fit in container {container_id}")
-                    continue
-                
-                print(f"DEBUG: Orientation {j+1} fits, looking for position...")
-                
-                # Find best position in this container
-                position = container_space.find_best_position(width, depth, height, item.priority)
-                
-                if position:
-                    x, y, z = position
-                    print(f"DEBUG: Found position: ({x}, {y}, {z})")
-                    
-                    # Calculate overall placement score
-                    placement_score = self._calculate_placement_score(
-                        item, container, x, y, z
-                    )
-                    print(f"DEBUG: Placement score: {placement_score}")
-                    
-                    if placement_score > best_score:
-                        best_score = placement_score
-                        best_placement = {
-                            "containerId": container_id,
-                            "position": {
-                                "startCoordinates": {
-                                    "width": float(x),
-                                    "depth": float(y),
-                                    "height": float(z)
-                                },
-                                "endCoordinates": {
-                                    "width": float(x + width),
-                                    "depth": float(y + depth),
-                                    "height": float(z + height)
-                                }
-                            }
-                        }
-                        print(f"DEBUG: New best placement found with score {best_score}")
-                else:
-                    print(f"DEBUG: No position found for orientation {j+1}")
-        
-        if best_placement:
-            print(f"DEBUG: Final best placement: {best_placement}")
-        else:
-            print(f"DEBUG: No placement found for item {item.itemId}")
-            
-        return best_placement
     
     def _initialize_container_spaces(self, containers: Dict[str, Container]):
         """Initialize container spaces for advanced space management"""
@@ -444,17 +492,20 @@ class EnhancedPlacementEngine:
     
     def _sort_containers_by_suitability(self, containers: Dict[str, Container], item: Item) -> List[Container]:
         """Sort containers by suitability for the item"""
-        container_scores = []
-        
-        for container in containers.values():
-            score = self._calculate_container_suitability(container, item)
-            container_scores.append((score, container))
-        
-        container_scores.sort(key=lambda x: x[0], reverse=True)
-        return [container for score, container in container_scores]
+        # sorted() computes each key once and is stable, so equal scores keep
+        # the containers' dict order
+        item_volume = item.width * item.depth * item.height
+        return sorted(
+            containers.values(),
+            key=lambda container: self._calculate_container_suitability(container, item, item_volume),
+            reverse=True
+        )
     
-    def _calculate_container_suitability(self, container: Container, item: Item) -> float:
+    def _calculate_container_suitability(self, container: Container, item: Item,
+                                         item_volume: Optional[float] = None) -> float:
         """Calculate how suitable a container is for an item"""
+        if item_volume is None:
+            item_volume = item.width * item.depth * item.height
         score = 0.0
         
         # Zone matching (highest priority)
@@ -465,7 +516,6 @@ class EnhancedPlacementEngine:
         
         # Space efficiency (prefer containers that aren't too large)
         container_volume = container.width * container.depth * container.height
-        item_volume = item.width * item.depth * item.height
         if container_volume > 0:
             efficiency = item_volume / container_volume
             score += efficiency * 100
@@ -473,7 +523,7 @@ class EnhancedPlacementEngine:
         # Available free space
         container_space = self.container_spaces.get(container.containerId)
         if container_space:
-            free_volume = sum(fs.volume for fs in container_space.free_spaces)
+            free_volume = container_space.free_volume
             if free_volume >= item_volume:
                 score += min(free_volume / item_volume, 10) * 50
         
@@ -481,11 +531,19 @@ class EnhancedPlacementEngine:
     
     def _is_zone_match(self, preferred: str, container_zone: str) -> bool:
         """Check if item's preferred zone matches container zone"""
+        key = (preferred, container_zone)
+        match = self._zone_match_cache.get(key)
+        if match is None:
+            match = self._zone_match_cache[key] = self._compute_zone_match(preferred, container_zone)
+        return match
+    
+    def _compute_zone_match(self, preferred: str, container_zone: str) -> bool:
+        """Uncached zone matching behind _is_zone_match"""
         if not preferred or not container_zone:
             return False
             
-        pref_clean = preferred.lower().replace('_', '').replace(' ', '').replace('-', '')
-        cont_clean = container_zone.lower().replace('_', '').replace(' ', '').replace('-', '')
+        pref_clean, pref_types = _zone_profile(preferred)
+        cont_clean, cont_types = _zone_profile(container_zone)
         
         # Exact match
         if pref_clean == cont_clean:
@@ -495,33 +553,26 @@ class EnhancedPlacementEngine:
         if pref_clean in cont_clean or cont_clean in pref_clean:
             return True
             
-        # Keyword-based matching for common zone types
-        zone_keywords = {
-            'lab': ['lab', 'research', 'science', 'experiment'],
-            'storage': ['storage', 'bay', 'cargo', 'warehouse'],
-            'maintenance': ['maintenance', 'engineering', 'repair', 'workshop'],
-            'crew': ['crew', 'quarters', 'living', 'personal'],
-            'medical': ['medical', 'health', 'hospital', 'clinic'],
-            'airlock': ['airlock', 'entry', 'exit', 'docking'],
-            'cockpit': ['cockpit', 'bridge', 'control', 'command']
-        }
-        
-        for zone_type, keywords in zone_keywords.items():
-            pref_match = any(keyword in pref_clean for keyword in keywords)
-            cont_match = any(keyword in cont_clean for keyword in keywords)
-            if pref_match and cont_match:
-                return True
-        
-        return False
-    
-    def _fits_in_container(self, width: float, depth: float, height: float, container: Container) -> bool:
-        """Check if item dimensions fit in container"""
-        return (width <= container.width and 
-                depth <= container.depth and 
-                height <= container.height)
+        # Keyword-based matching: both zones name the same zone type
+        return not pref_types.isdisjoint(cont_types)
     
     def _calculate_placement_score(self, item: Item, container: Container, x: float, y: float, z: float) -> float:
         """Calculate overall placement score"""
+        return self._placement_score_base(item, container) + self._position_score(y, z)
+    
+    @staticmethod
+    def _position_score(y: float, z: float) -> float:
+        """Position-dependent part of _calculate_placement_score"""
+        # Accessibility (prefer positions near opening)
+        accessibility = max(0, 100 - y)
+        
+        # Stability (prefer lower positions)
+        stability = max(0, 100 - z)
+        
+        return accessibility * 2 + stability
+    
+    def _placement_score_base(self, item: Item, container: Container) -> float:
+        """Position-independent part of _calculate_placement_score"""
         score = 0.0
         
         # Zone preference (important but not blocking)
@@ -533,14 +584,6 @@ class EnhancedPlacementEngine:
         # Priority weighting
         score += item.priority * 10
         
-        # Accessibility (prefer positions near opening)
-        accessibility = max(0, 100 - y)
-        score += accessibility * 2
-        
-        # Stability (prefer lower positions)
-        stability = max(0, 100 - z)
-        score += stability
-        
         return score
     
     def place_items(self, items: List[Item], containers: Dict[str, Container]) -> List[Dict]:
@@ -565,19 +608,11 @@ class EnhancedPlacementEngine:
     
     def _sort_items_by_priority(self, items: List[Item]) -> List[Item]:
         """Sort items by enhanced priority considering multiple factors"""
-        def calculate_priority_score(item: Item) -> float:
-            score = item.priority * 100  # Base priority
-            
-            # Size factor (smaller items first for better packing)
-            volume = item.width * item.depth * item.height
-            if volume < 1000:  # Small items
-                score += 50
-            elif volume > 10000:  # Large items (place early)
-                score += 25
-            
-            return score
-        
-        return sorted(items, key=calculate_priority_score, reverse=True)
+        return sorted(
+            items,
+            key=lambda item: _item_priority_score(item.priority, item.width, item.depth, item.height),
+            reverse=True
+        )
     
     def validate_placement(self, item: Item, container: Container, 
                           position: Dict, existing_items: Dict[str, Item]) -> Tuple[bool, str]:
@@ -599,10 +634,7 @@ class EnhancedPlacementEngine:
             placed_height = end["height"] - start["height"]
             
             # Check valid orientations
-            valid_orientations = [
-                (item.width, item.depth, item.height),
-                (item.depth, item.width, item.height)
-            ]
+            valid_orientations = self._footprint_orientations(item)
             
             orientation_match = any(
                 abs(placed_width - w) < 0.1 and 